@@ -57,13 +57,58 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+# Database: SQLite by default, PostgreSQL with DB_ENGINE=postgres.
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite").strip().lower()
+
+# SQLITE_TUNED=true: WAL lets readers run alongside the writer, and IMMEDIATE transactions
+# queue for the write lock (up to busy_timeout) instead of failing with "database is
+# locked" when they try to upgrade from a read. journal_mode=WAL is stored in the file.
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "false").lower() == "true"
+SQLITE_TUNED_OPTIONS = {
+    "init_command": (
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        f"PRAGMA busy_timeout={int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))};"
+        f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))};"
+    ),
+    "transaction_mode": "IMMEDIATE",
 }
 
+if DB_ENGINE in {"postgres", "postgresql"}:
+    DB_POOL = os.getenv("DB_POOL", "false").lower() == "true"
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("POSTGRES_DB", "linguaboost"),
+            "USER": os.getenv("POSTGRES_USER", "linguaboost"),
+            "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+            "HOST": os.getenv("POSTGRES_HOST", "localhost"),
+            "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            # Django refuses persistent connections together with psycopg's pool.
+            "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+                    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+                    "timeout": int(os.getenv("DB_POOL_TIMEOUT", 10)),
+                }
+            }
+            if DB_POOL
+            else {},
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {},
+        }
+    }
+    if SQLITE_TUNED:
+        DATABASES["default"]["OPTIONS"] = dict(SQLITE_TUNED_OPTIONS)
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -83,7 +128,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "trainer.authentication.CachingTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -91,20 +136,108 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Django cache for state that all workers must see: token cache versions and, with
+# LLM_RATE_LIMIT_BACKEND=cache, rate limits. The in-memory default is private to one
+# process, which is enough for a single runserver/uvicorn process; with several workers
+# set CACHE_BACKEND to a shared one (e.g. django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION=redis://...).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+CACHES = {"default": {"BACKEND": CACHE_BACKEND, "LOCATION": os.getenv("CACHE_LOCATION", "")}}
+if CACHE_BACKEND.endswith("LocMemCache"):
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 50000))}
+
+# Token -> user/profile cache used by CachingTokenAuthentication, per process. Entries are
+# checked against a version kept in CACHES[AUTH_TOKEN_CACHE_VERSIONS], which logout and
+# user/profile changes replace; 0 turns the cache off.
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+AUTH_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("AUTH_TOKEN_CACHE_TTL_SECONDS", 30))
+AUTH_TOKEN_CACHE_VERSIONS = os.getenv("AUTH_TOKEN_CACHE_VERSIONS", "default")
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ["ETag"]
 
 # OpenAI settings
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL_NAME = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
-
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+OPENAI_PROJECT = os.getenv("OPENAI_PROJECT", "")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")
+
+# Shared LLM client (see trainer/llm.py). LLM_BACKEND=fake answers offline for load tests.
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+LLM_FAKE_LATENCY_MS = int(os.getenv("LLM_FAKE_LATENCY_MS", 0))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 30))
+LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", 5))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 50))
+# httpx's async pool slows down when it has to juggle many idle keep-alive connections.
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 20))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 32))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", 10))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+LLM_RETRY_BASE_DELAY_SECONDS = float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", 0.5))
+LLM_RETRY_MAX_DELAY_SECONDS = float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", 8))
+
+# Rate limits and daily token budgets for the LLM endpoints (see trainer/quota.py); 0 turns
+# a limit off. Buckets are per process with "local"; "cache" shares them through
+# CACHES[LLM_RATE_LIMIT_CACHE], which then has to be a shared cache (Redis, Memcached, DB).
+LLM_RATE_LIMIT_BACKEND = os.getenv("LLM_RATE_LIMIT_BACKEND", "local")
+LLM_RATE_LIMIT_CACHE = os.getenv("LLM_RATE_LIMIT_CACHE", "default")
+LLM_USER_RATE_PER_MINUTE = float(os.getenv("LLM_USER_RATE_PER_MINUTE", 20))
+LLM_USER_BURST = int(os.getenv("LLM_USER_BURST", 10))
+LLM_GLOBAL_RATE_PER_MINUTE = float(os.getenv("LLM_GLOBAL_RATE_PER_MINUTE", 0))
+LLM_GLOBAL_BURST = int(os.getenv("LLM_GLOBAL_BURST", 50))
+LLM_USER_DAILY_TOKENS = int(os.getenv("LLM_USER_DAILY_TOKENS", 0))
+LLM_GLOBAL_DAILY_TOKENS = int(os.getenv("LLM_GLOBAL_DAILY_TOKENS", 0))
+# Share of LLM_GLOBAL_DAILY_TOKENS after which requests are shed with 503.
+LLM_SHED_AT = float(os.getenv("LLM_SHED_AT", 0.9))
+
+# Translation-check verdict cache (in-process LRU in front of a shared DB table)
+TRANSLATION_CACHE_ENABLED = os.getenv("TRANSLATION_CACHE_ENABLED", "true").lower() == "true"
+TRANSLATION_CACHE_TTL_SECONDS = int(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+TRANSLATION_CACHE_HOT_SIZE = int(os.getenv("TRANSLATION_CACHE_HOT_SIZE", 2048))
+TRANSLATION_CACHE_DB_MAX_ENTRIES = int(os.getenv("TRANSLATION_CACHE_DB_MAX_ENTRIES", 100000))
+TRANSLATION_CACHE_PRUNE_EVERY = int(os.getenv("TRANSLATION_CACHE_PRUNE_EVERY", 500))
+
+# Pre-generated sentence pool (see trainer/pool.py and the refill_sentence_pool command)
+SENTENCE_POOL_ENABLED = os.getenv("SENTENCE_POOL_ENABLED", "false").lower() == "true"
+SENTENCE_POOL_IN_PROCESS_REFILL = os.getenv("SENTENCE_POOL_IN_PROCESS_REFILL", "true").lower() == "true"
+SENTENCE_POOL_LOW_WATER = int(os.getenv("SENTENCE_POOL_LOW_WATER", 10))
+SENTENCE_POOL_TARGET = int(os.getenv("SENTENCE_POOL_TARGET", 20))
+SENTENCE_POOL_MAX_AGE_HOURS = int(os.getenv("SENTENCE_POOL_MAX_AGE_HOURS", 72))
+SENTENCE_POOL_BUCKET_IDLE_DAYS = int(os.getenv("SENTENCE_POOL_BUCKET_IDLE_DAYS", 7))
+
+# Training sessions: start a new one per calendar day ("daily"), after SESSION_IDLE_MINUTES
+# without generating ("idle"), or never ("none").
+SESSION_ROLLOVER = os.getenv("SESSION_ROLLOVER", "daily").strip().lower()
+SESSION_IDLE_MINUTES = int(os.getenv("SESSION_IDLE_MINUTES", 60))
+SESSION_ARCHIVE_AFTER_DAYS = int(os.getenv("SESSION_ARCHIVE_AFTER_DAYS", 180))
+
+# How generate/ picks words: the most overdue for review ("review") or at random ("random").
+WORD_SELECTION = os.getenv("WORD_SELECTION", "review").strip().lower()
+
+# Bulk vocabulary import (POST words/import/)
+WORD_IMPORT_MAX_ROWS = int(os.getenv("WORD_IMPORT_MAX_ROWS", 50000))
+WORD_IMPORT_CHUNK_SIZE = int(os.getenv("WORD_IMPORT_CHUNK_SIZE", 500))
+
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
 EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", 587))
 EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "true").lower() == "true"
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER or "noreply@example.com"
+# Seconds to wait on the SMTP server before a send counts as failed (and is retried).
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 10))
+
+# Outgoing mail is queued in EmailOutbox and sent by trainer.outbox: from a thread in each
+# web process (EMAIL_OUTBOX_IN_PROCESS) and/or by `manage.py dispatch_email --loop`.
+EMAIL_OUTBOX_IN_PROCESS = os.getenv("EMAIL_OUTBOX_IN_PROCESS", "true").lower() == "true"
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", 30))
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 6))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 30))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = int(os.getenv("EMAIL_OUTBOX_RETRY_MAX_SECONDS", 3600))
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
\ No newline at end of file
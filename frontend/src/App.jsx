@@ -109,6 +109,7 @@ export default function App() {
   const [wordsCount, setWordsCount] = useState(5);
   const [sentences, setSentences] = useState([]);
   const [sentencesWithWords, setSentencesWithWords] = useState([]);
+  const [exerciseIds, setExerciseIds] = useState([]);
   const [usedWords, setUsedWords] = useState([]);
   const [sessionInfo, setSessionInfo] = useState(null);
   const [translations, setTranslations] = useState({});
@@ -116,6 +117,7 @@ export default function App() {
   const [revealed, setRevealed] = useState({});
   const [generating, setGenerating] = useState(false);
   const [checkingIdx, setCheckingIdx] = useState(null);
+  const [checkErrors, setCheckErrors] = useState({});
 
   // Chat state
   const [chatMessages, setChatMessages] = useState([]);
@@ -317,9 +319,11 @@ export default function App() {
     setSelectedWords([]);
     setNewWord("");
     setSentences([]);
+    setExerciseIds([]);
     setTranslations({});
     setResults({});
     setRevealed({});
+    setCheckErrors({});
     setProgress(null);
     setShowProfileDropdown(false);
   };
@@ -403,9 +407,11 @@ export default function App() {
   const handleGenerate = async () => {
     const effectiveWordsCount = wordsCount === '' ? 5 : wordsCount;
     setGenerating(true);
+    setAuthError("");
     setResults({});
     setTranslations({});
     setRevealed({});
+    setCheckErrors({});
     try {
       const res = await api.post("/generate/", {
         level,
@@ -421,6 +427,7 @@ export default function App() {
       });
       setSentences(res.data.sentences || []);
       setSentencesWithWords(res.data.sentences_with_words || []);
+      setExerciseIds((res.data.exercises || []).map((exercise) => exercise.id));
       setUsedWords(res.data.words_used || []);
       setSessionInfo(res.data.session || null);
       if (res.data.used_genai === false) {
@@ -441,9 +448,11 @@ export default function App() {
     const translation = translations[idx] || "";
     if (!translation.trim()) return;
     setCheckingIdx(idx);
+    setCheckErrors((prev) => ({ ...prev, [idx]: "" }));
     try {
       const res = await api.post("/check/", {
         sentence,
+        exercise_id: exerciseIds[idx],
         translation,
         language_direction: languageDirection,
       });
@@ -451,6 +460,7 @@ export default function App() {
       fetchProgress();
     } catch (err) {
       console.error(err);
+      setCheckErrors((prev) => ({ ...prev, [idx]: err.response?.data?.detail || "Checking failed. Please try again." }));
     } finally {
       setCheckingIdx(null);
     }
@@ -458,9 +468,11 @@ export default function App() {
 
   const handleReveal = async (sentence, idx) => {
     setCheckingIdx(idx);
+    setCheckErrors((prev) => ({ ...prev, [idx]: "" }));
     try {
       const res = await api.post("/check/", {
         sentence,
+        exercise_id: exerciseIds[idx],
         translation: "", // empty translation to get correct answer
         language_direction: languageDirection,
       });
@@ -468,6 +480,7 @@ export default function App() {
       fetchProgress();
     } catch (err) {
       console.error(err);
+      setCheckErrors((prev) => ({ ...prev, [idx]: err.response?.data?.detail || "Checking failed. Please try again." }));
     } finally {
       setCheckingIdx(null);
     }
@@ -487,7 +500,7 @@ export default function App() {
     } catch (err) {
       setChatMessages((prev) => [...prev, { 
         role: "assistant", 
-        content: "Sorry, I couldn't process your request. Please try again." 
+        content: err.response?.data?.detail || "Sorry, I couldn't process your request. Please try again." 
       }]);
     } finally {
       setChatLoading(false);
@@ -1036,6 +1049,7 @@ export default function App() {
                     <button className="button-primary button-full" onClick={(e) => { e.stopPropagation(); handleGenerate(); }} disabled={generating}>
                       {generating ? "Generating..." : "Generate Sentences"}
                     </button>
+                    {authError && <div className="error-message">{authError}</div>}
                     {usedWords.length > 0 && (
                       <div className="used-words">
                         <span className="used-words-label">Using words:</span>
@@ -1295,6 +1309,7 @@ export default function App() {
                               {checkingIdx === idx ? "Loading..." : "I Don't Know"}
                             </button>
                           </div>
+                          {checkErrors[idx] && <div className="error-message">{checkErrors[idx]}</div>}
                         </>
                       )}
 
@@ -1,6 +1,22 @@
 from django.contrib import admin
 
-from .models import Exercise, Profile, Session, VerificationCode, Word
+from .models import (
+    ArchivedSession,
+    DailyActivity,
+    EmailOutbox,
+    Exercise,
+    LLMUsage,
+    PooledSentence,
+    Profile,
+    Session,
+    SentencePoolBucket,
+    TranslationVerdict,
+    UserStats,
+    VerificationCode,
+    Word,
+    WordReviewState,
+    WordTombstone,
+)
 
 
 @admin.register(Word)
@@ -9,6 +25,16 @@ class WordAdmin(admin.ModelAdmin):
     search_fields = ("text",)
 
 
+@admin.register(WordReviewState)
+class WordReviewStateAdmin(admin.ModelAdmin):
+    list_display = ("word", "user", "language", "due_at", "interval_days", "lapses")
+
+
+@admin.register(WordTombstone)
+class WordTombstoneAdmin(admin.ModelAdmin):
+    list_display = ("word_id", "user", "revision", "deleted_at")
+
+
 @admin.register(Exercise)
 class ExerciseAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "sentence", "is_correct")
@@ -22,6 +48,21 @@ class SessionAdmin(admin.ModelAdmin):
     filter_horizontal = ("exercises",)
 
 
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    list_display = ("user", "words_total", "exercises_total", "attempts_total", "days_practiced", "last_practice_date")
+
+
+@admin.register(DailyActivity)
+class DailyActivityAdmin(admin.ModelAdmin):
+    list_display = ("user", "date", "exercises", "attempts", "correct")
+
+
+@admin.register(ArchivedSession)
+class ArchivedSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "date", "exercises_total", "attempts_total", "correct_total")
+
+
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "is_email_verified", "two_factor_enabled")
@@ -32,3 +73,33 @@ class ProfileAdmin(admin.ModelAdmin):
 class VerificationCodeAdmin(admin.ModelAdmin):
     list_display = ("user", "purpose", "code", "is_used", "expires_at", "created_at")
     list_filter = ("purpose", "is_used")
+
+
+@admin.register(TranslationVerdict)
+class TranslationVerdictAdmin(admin.ModelAdmin):
+    list_display = ("cache_key", "language_direction", "model_name", "last_used_at", "expires_at")
+    list_filter = ("language_direction", "model_name")
+
+
+@admin.register(SentencePoolBucket)
+class SentencePoolBucketAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "source_language", "level", "topic", "tense", "last_requested_at", "last_refilled_at")
+    list_filter = ("source_language", "level")
+
+
+@admin.register(PooledSentence)
+class PooledSentenceAdmin(admin.ModelAdmin):
+    list_display = ("id", "bucket", "sentence", "created_at")
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ("id", "subject", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+
+
+@admin.register(LLMUsage)
+class LLMUsageAdmin(admin.ModelAdmin):
+    list_display = ("date", "user", "requests", "prompt_tokens", "completion_tokens", "total_tokens")
+    list_filter = ("date",)
@@ -0,0 +1,227 @@
+"""Async (ASGI) versions of the LLM-bound endpoints.
+
+DRF's ``APIView`` is synchronous, so these are plain Django async views that do their own
+token authentication. Served under ASGI, a request waiting on the model only parks a
+coroutine instead of a worker thread. Their request and response bodies, and the rate
+limits of :mod:`trainer.quota`, match the sync ``generate/``, ``check/`` and ``chat/``
+endpoints (streaming is not offered here).
+"""
+
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from . import llm, quota
+from .authentication import cached_token
+from .serializers import ExerciseSerializer, SessionSummarySerializer
+from .views import (
+    _chat_messages,
+    _check_messages,
+    _check_result,
+    _check_shortcut,
+    _generation_kwargs,
+    _generation_messages,
+    _generation_options,
+    _offline_check,
+    _parse_exercise_id,
+    _parse_generated_sentences,
+    _prepare_generation,
+    _record_check,
+    _save_exercises,
+    generate_sentences_with_genai,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _authenticate(request):
+    """Resolve ``Authorization: Token <key>`` to an active user (with profile), or None."""
+    parts = request.headers.get("Authorization", "").split()
+    if len(parts) != 2 or parts[0].lower() != "token":
+        return None
+    token = await sync_to_async(cached_token)(parts[1])
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+def _json_body(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _error(detail: str, status: int) -> JsonResponse:
+    return JsonResponse({"detail": detail}, status=status)
+
+
+def _rejected(exc: quota.Rejected) -> JsonResponse:
+    response = _error(exc.detail, exc.status_code)
+    response["Retry-After"] = str(exc.retry_after)
+    return response
+
+
+def _ai_failure(exc: Exception, what: str) -> JsonResponse:
+    message = str(exc)
+    if isinstance(exc, llm.OVERLOAD_ERRORS):
+        logger.warning("%s quota hit: %s", what, message)
+        return _error("AI is overloaded. Please try again later.", 503)
+    logger.exception("%s failed", what)
+    return _error("AI request failed. Please try again.", 500)
+
+
+def _serialize_exercises(exercises):
+    return ExerciseSerializer(exercises, many=True).data
+
+
+@csrf_exempt
+@require_POST
+async def generate(request):
+    user = await _authenticate(request)
+    if user is None:
+        return _error("Authentication credentials were not provided.", 401)
+    data = _json_body(request)
+    if data is None:
+        return _error("Request body must be a JSON object.", 400)
+
+    options = _generation_options(data, getattr(user, "profile", None))
+    try:
+        sentences, selected_words, user_words, session = await sync_to_async(_prepare_generation)(
+            user, options, admit=llm.is_enabled()
+        )
+    except quota.Rejected as exc:
+        return _rejected(exc)
+
+    if sentences is None:
+        try:
+            if llm.is_enabled():
+                response = await llm.achat_completion(
+                    purpose=llm.PURPOSE_GENERATE,
+                    messages=_generation_messages(
+                        user_words,
+                        options["level"],
+                        options["length"],
+                        options["num_sentences"],
+                        **_generation_kwargs(options),
+                    ),
+                    max_tokens=500,
+                    temperature=0.7,
+                    user_id=user.id,
+                )
+                sentences = _parse_generated_sentences(response.choices[0].message.content, options["num_sentences"])
+            else:
+                sentences = generate_sentences_with_genai(
+                    user_words,
+                    options["level"],
+                    options["length"],
+                    options["num_sentences"],
+                    user_id=user.id,
+                    **_generation_kwargs(options),
+                )
+        except Exception as exc:  # pragma: no cover - runtime safeguard
+            return _ai_failure(exc, "Generation")
+
+    sentences_with_words, exercises = await sync_to_async(_save_exercises)(user, session, sentences, selected_words, user_words)
+
+    session.date = timezone.now()
+    await session.asave(update_fields=["date"])
+
+    return JsonResponse(
+        {
+            "sentences": sentences,
+            "sentences_with_words": sentences_with_words,
+            "words_used": user_words,
+            "session": SessionSummarySerializer(session).data,
+            "exercises": await sync_to_async(_serialize_exercises)(exercises),
+            "used_genai": llm.is_enabled(),
+            "fallback_reason": None,
+        }
+    )
+
+
+@csrf_exempt
+@require_POST
+async def check_translation(request):
+    user = await _authenticate(request)
+    if user is None:
+        return _error("Authentication credentials were not provided.", 401)
+    data = _json_body(request)
+    if data is None:
+        return _error("Request body must be a JSON object.", 400)
+
+    sentence = data.get("sentence")
+    translation = data.get("translation")
+    if translation is None:
+        translation = data.get("user_translation", "")
+    language_direction = data.get("language_direction", "es-to-en")
+    if not sentence or translation is None:
+        return _error("Both 'sentence' and 'translation' are required.", 400)
+    try:
+        exercise_id = _parse_exercise_id(data.get("exercise_id"))
+    except ValueError:
+        return _error("'exercise_id' must be an integer.", 400)
+
+    try:
+        if not llm.is_enabled():
+            result = _offline_check(sentence, translation)
+        else:
+            result, cache_key = await sync_to_async(_check_shortcut)(sentence, translation, language_direction)
+            if result is None:
+                await sync_to_async(quota.admit)(user.id)
+                response = await llm.achat_completion(
+                    purpose=llm.PURPOSE_CHECK,
+                    messages=_check_messages(sentence, translation, language_direction),
+                    max_tokens=200,
+                    temperature=0.7,
+                    user_id=user.id,
+                )
+                result = await sync_to_async(_check_result)(response, translation, cache_key, language_direction)
+    except quota.Rejected as exc:
+        return _rejected(exc)
+    except Exception as exc:
+        return _ai_failure(exc, "Translation check")
+
+    await sync_to_async(_record_check)(user, sentence, translation, result, exercise_id)
+    return JsonResponse(result)
+
+
+@csrf_exempt
+@require_POST
+async def chat(request):
+    user = await _authenticate(request)
+    if user is None:
+        return _error("Authentication credentials were not provided.", 401)
+    data = _json_body(request)
+    if data is None:
+        return _error("Request body must be a JSON object.", 400)
+
+    message = str(data.get("message", "")).strip()
+    if not message:
+        return _error("Message is required.", 400)
+    if not llm.is_enabled():
+        return JsonResponse({"response": "Sorry, AI chat is not available at the moment."})
+
+    try:
+        await sync_to_async(quota.admit)(user.id)
+        response = await llm.achat_completion(
+            purpose=llm.PURPOSE_CHAT,
+            messages=_chat_messages(message),
+            max_tokens=350,
+            temperature=0.7,
+            user_id=user.id,
+        )
+    except quota.Rejected as exc:
+        return _rejected(exc)
+    except llm.OVERLOAD_ERRORS as exc:
+        return _ai_failure(exc, "Chat")
+    except Exception:
+        logger.exception("Chat request failed")
+        return _error("Failed to get response from AI.", 500)
+    return JsonResponse({"response": response.choices[0].message.content.strip()})
@@ -0,0 +1,96 @@
+import copy
+import math
+import uuid
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from .cache import LRUCache
+
+
+class TokenCache:
+    """Per-process cache of token key -> Token with its user and profile loaded.
+
+    Callers get a deep copy, so a view changing ``request.user`` cannot leak into other
+    requests. Every entry carries the version its token had in the Django cache
+    ``AUTH_TOKEN_CACHE_VERSIONS`` when it was loaded. :meth:`forget_user` replaces that
+    version, so entries are dropped in every process sharing the cache, not only this one.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, versions_alias: str):
+        self.enabled = ttl_seconds > 0
+        self.versions_alias = versions_alias
+        # An expired version only turns the next lookup into a miss, so it need not outlive the entries.
+        self._version_timeout = math.ceil(ttl_seconds) + 60
+        self._entries = LRUCache(max_entries, ttl_seconds)
+
+    @staticmethod
+    def _version_key(key: str) -> str:
+        return f"auth-token-version:{key}"
+
+    def version(self, key: str) -> str:
+        """The current version of token ``key``. Read it before loading the token, so a change
+        committed in between makes the stored entry stale rather than current."""
+        return caches[self.versions_alias].get_or_set(
+            self._version_key(key), lambda: uuid.uuid4().hex, timeout=self._version_timeout
+        )
+
+    def get(self, key: str) -> Optional[Token]:
+        entry = self._entries.get(key) if self.enabled else None
+        if entry is None:
+            return None
+        token, version = entry
+        if caches[self.versions_alias].get(self._version_key(key)) != version:
+            self._entries.delete(key)
+            return None
+        return copy.deepcopy(token)
+
+    def set(self, token: Token, version: str) -> None:
+        if self.enabled:
+            self._entries.set(token.key, (copy.deepcopy(token), version))
+
+    def forget(self, keys: Iterable[str]) -> None:
+        versions = caches[self.versions_alias]
+        for key in keys:
+            self._entries.delete(key)
+            versions.set(self._version_key(key), uuid.uuid4().hex, timeout=self._version_timeout)
+
+    def forget_user(self, user_id: int) -> None:
+        self.forget(Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = TokenCache(
+    settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_TTL_SECONDS, settings.AUTH_TOKEN_CACHE_VERSIONS
+)
+
+
+def cached_token(key: str) -> Optional[Token]:
+    """The token with ``key``, with ``user.profile`` loaded. Only active users' tokens are cached."""
+    token = token_cache.get(key)
+    if token is not None:
+        return token
+    version = token_cache.version(key) if token_cache.enabled else None
+    token = Token.objects.select_related("user", "user__profile").filter(key=key).first()
+    if token is not None and token.user.is_active:
+        token_cache.set(token, version)
+    return token
+
+
+class CachingTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` backed by :data:`token_cache`: no query on a cache hit."""
+
+    def authenticate_credentials(self, key):
+        token = cached_token(key)
+        if token is None:
+            raise AuthenticationFailed(_("Invalid token."))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_("User inactive or deleted."))
+        return token.user, token
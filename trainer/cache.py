@@ -0,0 +1,189 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Hashable, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError
+from django.utils import timezone
+
+from .models import TranslationVerdict
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Don't rewrite last_used_at on every DB hit; LRU order only needs to be roughly right.
+DB_TOUCH_INTERVAL = timedelta(minutes=5)
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TranslationVerdictCache:
+    """Two-tier cache of translation-check verdicts.
+
+    The hot tier is a per-process LRU; the DB tier (``TranslationVerdict``) is shared by
+    every worker. Keys are built from the already-normalized sentence/translation pair,
+    the language direction and the model name, so the cache invalidates itself when the
+    model changes.
+    """
+
+    def __init__(self):
+        self.ttl_seconds = settings.TRANSLATION_CACHE_TTL_SECONDS
+        self.db_max_entries = settings.TRANSLATION_CACHE_DB_MAX_ENTRIES
+        self.prune_every = settings.TRANSLATION_CACHE_PRUNE_EVERY
+        self.hot = LRUCache(settings.TRANSLATION_CACHE_HOT_SIZE, self.ttl_seconds)
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._counters = {"hot_hits": 0, "db_hits": 0, "misses": 0, "writes": 0, "pruned": 0}
+
+    @staticmethod
+    def make_key(normalized_sentence: str, normalized_translation: str, language_direction: str, model_name: str) -> str:
+        raw = "\x1f".join([model_name, language_direction, normalized_sentence, normalized_translation])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, key: str) -> Optional[dict]:
+        verdict = self.hot.get(key)
+        if verdict is not None:
+            self._count("hot_hits")
+            return dict(verdict)
+
+        now = timezone.now()
+        try:
+            row = (
+                TranslationVerdict.objects.filter(cache_key=key, expires_at__gt=now)
+                .only("id", "verdict", "expires_at", "last_used_at")
+                .first()
+            )
+            if row is not None and now - row.last_used_at > DB_TOUCH_INTERVAL:
+                TranslationVerdict.objects.filter(pk=row.pk).update(last_used_at=now)
+        except DatabaseError:
+            logger.warning("Translation cache lookup failed", exc_info=True)
+            row = None
+
+        if row is None:
+            self._count("misses")
+            return None
+
+        self._count("db_hits")
+        remaining = (row.expires_at - now).total_seconds()
+        self.hot.set(key, row.verdict, ttl_seconds=min(self.ttl_seconds, remaining))
+        return dict(row.verdict)
+
+    def set(self, key: str, verdict: dict, *, language_direction: str, model_name: str) -> None:
+        self.hot.set(key, dict(verdict))
+        now = timezone.now()
+        try:
+            TranslationVerdict.objects.update_or_create(
+                cache_key=key,
+                defaults={
+                    "language_direction": language_direction,
+                    "model_name": model_name,
+                    "verdict": verdict,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                    "last_used_at": now,
+                },
+            )
+        except IntegrityError:
+            # Another worker stored the same key first; its verdict is just as good.
+            pass
+        except DatabaseError:
+            logger.warning("Translation cache write failed", exc_info=True)
+            return
+
+        self._count("writes")
+        with self._lock:
+            self._writes_since_prune += 1
+            should_prune = self._writes_since_prune >= self.prune_every
+            if should_prune:
+                self._writes_since_prune = 0
+        if should_prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop expired rows, then the least recently used ones above the size limit."""
+        try:
+            deleted, _ = TranslationVerdict.objects.filter(expires_at__lte=timezone.now()).delete()
+            overflow = TranslationVerdict.objects.count() - self.db_max_entries
+            if overflow > 0:
+                stale_ids = list(
+                    TranslationVerdict.objects.order_by("last_used_at").values_list("id", flat=True)[:overflow]
+                )
+                more, _ = TranslationVerdict.objects.filter(id__in=stale_ids).delete()
+                deleted += more
+        except DatabaseError:
+            logger.warning("Translation cache prune failed", exc_info=True)
+            return 0
+        self._count("pruned", deleted)
+        return deleted
+
+    def clear(self) -> None:
+        self.hot.clear()
+        TranslationVerdict.objects.all().delete()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hot_hits"] + counters["db_hits"] + counters["misses"]
+        hits = counters["hot_hits"] + counters["db_hits"]
+        counters.update(
+            {
+                "lookups": lookups,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "hot_entries": len(self.hot),
+                "hot_max_entries": self.hot.max_entries,
+                "db_entries": TranslationVerdict.objects.count(),
+                "db_max_entries": self.db_max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+        )
+        return counters
+
+
+translation_cache = TranslationVerdictCache()
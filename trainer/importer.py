@@ -0,0 +1,292 @@
+"""Bulk vocabulary import from CSV, TSV, JSON and Anki plain-text exports.
+
+Uploads are parsed as a stream of rows, so a large file is never held in memory as a
+whole. Rows are deduplicated against one fetch of the user's existing words and inserted
+in chunks with ``bulk_create(ignore_conflicts=True)``; a row the insert skipped after all
+(a concurrent import of the same word) is reported as a duplicate, not as created.
+"""
+
+import codecs
+import csv
+import html
+import io
+import json
+import re
+import string
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Word
+
+FORMAT_CSV = "csv"
+FORMAT_TSV = "tsv"
+FORMAT_JSON = "json"
+FORMAT_ANKI = "anki"
+FORMATS = (FORMAT_CSV, FORMAT_TSV, FORMAT_JSON, FORMAT_ANKI)
+
+_EXTENSION_FORMATS = {
+    "csv": FORMAT_CSV,
+    "tsv": FORMAT_TSV,
+    "tab": FORMAT_TSV,
+    "json": FORMAT_JSON,
+    "jsonl": FORMAT_JSON,
+    "ndjson": FORMAT_JSON,
+    "txt": FORMAT_ANKI,  # Anki's "Notes in Plain Text" export
+}
+
+_TEXT_COLUMNS = ("text", "word", "front", "term")
+_LANGUAGE_COLUMNS = ("language", "lang")
+
+# Anki's "#separator:" header values.
+_ANKI_SEPARATORS = {"tab": "\t", "comma": ",", "semicolon": ";", "pipe": "|", "space": " ", "colon": ":"}
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+_READ_SIZE = 64 * 1024
+_MAX_TEXT_LENGTH = Word._meta.get_field("text").max_length
+_MAX_LANGUAGE_LENGTH = Word._meta.get_field("language").max_length
+
+STATUS_CREATED = "created"
+STATUS_DUPLICATE = "duplicate"
+STATUS_SKIPPED = "skipped"
+STATUS_ERROR = "error"
+
+
+class ImportFormatError(ValueError):
+    """The upload cannot be parsed in the requested format."""
+
+
+def detect_format(filename: str, requested: str = "") -> str:
+    requested = (requested or "").strip().lower()
+    if requested:
+        if requested not in FORMATS:
+            raise ImportFormatError(f"Unknown format '{requested}'. Use one of: {', '.join(FORMATS)}.")
+        return requested
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in (filename or "") else ""
+    if extension not in _EXTENSION_FORMATS:
+        raise ImportFormatError("Cannot tell the file format from its name; pass 'format'.")
+    return _EXTENSION_FORMATS[extension]
+
+
+def _text_stream(binary) -> io.TextIOBase:
+    # utf-8-sig drops the BOM that spreadsheet exports like to add.
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def _header_columns(row: List[str]) -> Optional[Tuple[int, Optional[int]]]:
+    """Column indexes of (text, language) if ``row`` is a header row, else None."""
+    names = [cell.strip().lower() for cell in row]
+    text_idx = next((names.index(n) for n in _TEXT_COLUMNS if n in names), None)
+    if text_idx is None:
+        return None
+    lang_idx = next((names.index(n) for n in _LANGUAGE_COLUMNS if n in names), None)
+    return text_idx, lang_idx
+
+
+def _delimited_rows(lines: Iterable[str], delimiter: str) -> Iterator[Tuple[str, Optional[str]]]:
+    text_idx, lang_idx = 0, None
+    for position, row in enumerate(csv.reader(lines, delimiter=delimiter)):
+        if position == 0:
+            header = _header_columns(row)
+            if header is not None:
+                text_idx, lang_idx = header
+                continue
+        if not row:
+            continue
+        text = row[text_idx] if text_idx < len(row) else ""
+        language = row[lang_idx] if lang_idx is not None and lang_idx < len(row) else None
+        yield text, language
+
+
+def _anki_rows(stream: io.TextIOBase) -> Iterator[Tuple[str, Optional[str]]]:
+    """Front field of each note; honours the ``#separator:`` and ``#html:`` file headers."""
+    delimiter = "\t"
+    strip_html = True
+    line = stream.readline()
+    while line.startswith("#"):
+        key, _, value = line[1:].strip().partition(":")
+        key, value = key.strip().lower(), value.strip().lower()
+        if key == "separator":
+            delimiter = _ANKI_SEPARATORS.get(value, value[:1] or "\t")
+        elif key == "html":
+            strip_html = value == "true"
+        line = stream.readline()
+
+    def lines():
+        if line:
+            yield line
+        yield from stream
+
+    for row in csv.reader(lines(), delimiter=delimiter):
+        if not row:
+            continue
+        text = row[0]
+        if strip_html:
+            text = html.unescape(_HTML_TAG.sub(" ", text))
+        yield text, None
+
+
+def _json_values(binary) -> Iterator[object]:
+    """Yield the elements of a top-level JSON array, or each value of a JSON Lines file.
+
+    The upload is decoded incrementally with ``raw_decode``; only the value being parsed
+    (plus one read buffer) is ever held in memory.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array = None  # unknown until the first significant character
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = binary.read(_READ_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + utf8.decode(chunk or b"", final=eof)
+        pos = 0
+
+    while True:
+        # Skip separators between values.
+        while pos < len(buffer) and (buffer[pos].isspace() or (in_array and buffer[pos] == ",")):
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                break
+            read_more()
+            continue
+
+        if in_array is None:
+            in_array = buffer[pos] == "["
+            if in_array:
+                pos += 1
+            continue
+        if in_array and buffer[pos] == "]":
+            break
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as exc:
+            if eof:
+                raise ImportFormatError(f"Invalid JSON: {exc.msg}.") from None
+            read_more()
+            continue
+        # A number or literal cut at the buffer edge decodes "successfully" but short.
+        if end == len(buffer) and not eof and not isinstance(value, (dict, list, str)):
+            read_more()
+            continue
+        yield value
+        pos = end
+
+
+def _json_rows(binary) -> Iterator[Tuple[str, Optional[str]]]:
+    for value in _json_values(binary):
+        if isinstance(value, str):
+            yield value, None
+        elif isinstance(value, dict):
+            text = next((value[key] for key in _TEXT_COLUMNS if key in value), "")
+            language = next((value[key] for key in _LANGUAGE_COLUMNS if key in value), None)
+            yield (text if isinstance(text, str) else ""), (language if isinstance(language, str) else None)
+        else:
+            yield "", None
+
+
+def iter_rows(upload, fmt: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """(text, language or None) for every data row of ``upload`` (a binary file object)."""
+    if fmt == FORMAT_JSON:
+        return _json_rows(upload)
+    stream = _text_stream(upload)
+    if fmt == FORMAT_ANKI:
+        return _anki_rows(stream)
+    return _delimited_rows(stream, "," if fmt == FORMAT_CSV else "\t")
+
+
+def _lower(value: str) -> str:
+    # LOWER() as the database computes it: SQLite's folds ASCII letters only, so there
+    # "Ñandú" and "ñandú" are two words.
+    if connection.vendor == "sqlite":
+        return value.translate(_ASCII_LOWER)
+    return value.lower()
+
+
+def _key(text: str, language: str) -> Tuple[str, str]:
+    """The unique_word_per_user_ci key of a word, as the database will compare it."""
+    return _lower(text), _lower(language)
+
+
+def import_words(user, rows: Iterable[Tuple[str, Optional[str]]], default_language: str) -> dict:
+    """Insert new words from ``rows`` and describe what happened to each of them."""
+    started = time.perf_counter()
+    chunk_size = settings.WORD_IMPORT_CHUNK_SIZE
+    max_rows = settings.WORD_IMPORT_MAX_ROWS
+
+    existing = {_key(text, language) for text, language in Word.objects.filter(user=user).values_list("text", "language")}
+
+    results: List[dict] = []
+    pending: List[Tuple[Word, dict]] = []
+    counts = {STATUS_CREATED: 0, STATUS_DUPLICATE: 0, STATUS_SKIPPED: 0, STATUS_ERROR: 0}
+    truncated = False
+
+    def flush():
+        words = [word for word, _ in pending]
+        Word.objects.bulk_create(words, batch_size=chunk_size, ignore_conflicts=True)
+        # Each queued word got its own revision, so the ones written are those found under them.
+        revisions = [word.revision for word in words]
+        written = set(
+            Word.objects.filter(user=user, revision__range=(min(revisions), max(revisions))).values_list(
+                "revision", flat=True
+            )
+        )
+        for word, result in pending:
+            if word.revision not in written:
+                result["status"] = STATUS_DUPLICATE
+                counts[STATUS_CREATED] -= 1
+                counts[STATUS_DUPLICATE] += 1
+        pending.clear()
+
+    for row_number, (raw_text, raw_language) in enumerate(rows, start=1):
+        if row_number > max_rows:
+            truncated = True
+            break
+        text = (raw_text or "").strip()
+        language = (raw_language or "").strip() or default_language
+
+        if not text:
+            status, detail = STATUS_SKIPPED, "No word text in this row."
+        elif len(text) > _MAX_TEXT_LENGTH:
+            status, detail = STATUS_ERROR, f"Text is longer than {_MAX_TEXT_LENGTH} characters."
+        elif len(language) > _MAX_LANGUAGE_LENGTH:
+            status, detail = STATUS_ERROR, f"Language is longer than {_MAX_LANGUAGE_LENGTH} characters."
+        elif _key(text, language) in existing:
+            status, detail = STATUS_DUPLICATE, ""
+        else:
+            status, detail = STATUS_CREATED, ""
+            existing.add(_key(text, language))
+
+        counts[status] += 1
+        result = {"row": row_number, "text": text, "language": language, "status": status}
+        if detail:
+            result["detail"] = detail
+        results.append(result)
+        if status == STATUS_CREATED:
+            pending.append((Word(user=user, text=text, language=language), result))
+            if len(pending) >= chunk_size:
+                flush()
+
+    if pending:
+        flush()
+
+    elapsed = time.perf_counter() - started
+    processed = len(results)
+    return {
+        **counts,
+        "rows": processed,
+        "truncated": truncated,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "rows_per_second": round(processed / elapsed, 1) if elapsed > 0 else None,
+        "results": results,
+    }
@@ -0,0 +1,373 @@
+"""Process-wide access to the chat-completion backend.
+
+Every LLM call site goes through :func:`chat_completion` (or :func:`achat_completion`
+from async views), which shares one pooled HTTP client, retries transient failures with
+jittered exponential backoff and caps the number of in-flight requests. Given a
+``user_id``, the tokens a call spent are recorded in :class:`~trainer.models.LLMUsage`
+(see :mod:`trainer.quota`). ``LLM_BACKEND=fake`` swaps OpenAI for a canned, offline
+backend so the endpoints can be load-tested without a key or network access.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+import weakref
+from types import SimpleNamespace
+from typing import Iterator, List, Optional
+
+import httpx
+import openai
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PURPOSE_GENERATE = "generate"
+PURPOSE_CHECK = "check"
+PURPOSE_CHECK_BATCH = "check_batch"
+PURPOSE_CHAT = "chat"
+
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class LLMOverloaded(Exception):
+    """Raised when no concurrency slot frees up within LLM_QUEUE_TIMEOUT_SECONDS."""
+
+
+# Failures that mean "try again later" rather than a bug. Running out of OpenAI quota
+# (insufficient_quota) is a RateLimitError as well.
+OVERLOAD_ERRORS = (LLMOverloaded, openai.RateLimitError)
+
+
+def backend_name() -> str:
+    return (settings.LLM_BACKEND or "openai").strip().lower()
+
+
+def model_name() -> str:
+    """Identity of the model answering, for keys of stored LLM output (verdicts, pooled sentences)."""
+    return "fake" if backend_name() == "fake" else settings.OPENAI_MODEL_NAME
+
+
+def is_enabled() -> bool:
+    """Whether calls reach a model at all; without one the views use their offline fallbacks."""
+    return backend_name() == "fake" or bool(settings.OPENAI_API_KEY)
+
+
+def estimate_usage(messages: List[dict], content: str) -> SimpleNamespace:
+    """``response.usage`` lookalike from a rough 4-characters-per-token estimate."""
+    prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+    completion_tokens = len(content) // 4
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+    )
+
+
+def _record_usage(user_id: Optional[int], usage) -> None:
+    from .quota import record_usage  # trainer.quota imports this module
+
+    record_usage(user_id, usage)
+
+
+class FakeBackend:
+    """Offline stand-in for the OpenAI client with a fixed latency and deterministic output."""
+
+    _BATCH_ITEM = re.compile(r"^\[(\d+)\] User's translation", re.MULTILINE)
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+
+    def content_for(self, purpose: str, messages: List[dict]) -> str:
+        prompt = messages[-1]["content"] if messages else ""
+        if purpose == PURPOSE_GENERATE:
+            return json.dumps({"sentences": [f"Esta es la frase de prueba número {i + 1}." for i in range(10)]})
+        if purpose == PURPOSE_CHECK:
+            return json.dumps({"is_correct": True, "correct_translation": "This is a test sentence.", "explanation": ""})
+        if purpose == PURPOSE_CHECK_BATCH:
+            ids = sorted({int(m) for m in self._BATCH_ITEM.findall(prompt)})
+            return json.dumps(
+                {
+                    "results": [
+                        {"id": i, "is_correct": True, "correct_translation": "This is a test sentence.", "explanation": ""}
+                        for i in ids
+                    ]
+                }
+            )
+        return "This is a canned answer from the fake LLM backend."
+
+    def create(self, *, purpose: str, messages: List[dict], stream: bool = False, **kwargs):
+        content = self.content_for(purpose, messages)
+        if not stream:
+            time.sleep(self.latency_seconds)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+                usage=estimate_usage(messages, content),
+            )
+        return self._stream(content)
+
+    async def acreate(self, *, purpose: str, messages: List[dict], **kwargs):
+        content = self.content_for(purpose, messages)
+        await asyncio.sleep(self.latency_seconds)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=estimate_usage(messages, content),
+        )
+
+    def _stream(self, content: str) -> Iterator[SimpleNamespace]:
+        pieces = [content[i:i + 16] for i in range(0, len(content), 16)] or [""]
+        for piece in pieces:
+            time.sleep(self.latency_seconds / len(pieces))
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+_client = None
+_client_lock = threading.Lock()
+_slots = None
+
+
+def _concurrency_slots() -> threading.BoundedSemaphore:
+    global _slots
+    if _slots is None:
+        with _client_lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(settings.LLM_MAX_CONCURRENCY)
+    return _slots
+
+
+def get_client():
+    """The shared client for this process (an ``openai.OpenAI`` or a :class:`FakeBackend`)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def _client_options() -> dict:
+    timeout = openai.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS)
+    return {
+        "api_key": settings.OPENAI_API_KEY,
+        "project": settings.OPENAI_PROJECT or None,
+        "base_url": settings.OPENAI_BASE_URL or None,
+        "timeout": timeout,
+        "max_retries": 0,  # retries happen in chat_completion, with jitter
+    }
+
+
+def _connection_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=min(settings.LLM_MAX_KEEPALIVE_CONNECTIONS, settings.LLM_MAX_CONNECTIONS),
+    )
+
+
+def _build_client():
+    if backend_name() == "fake":
+        return FakeBackend(latency_seconds=settings.LLM_FAKE_LATENCY_MS / 1000)
+
+    options = _client_options()
+    http_client = openai.DefaultHttpxClient(limits=_connection_limits(), timeout=options["timeout"])
+    return openai.OpenAI(http_client=http_client, **options)
+
+
+# Async clients and semaphores are bound to the event loop that created them.
+_async_state = weakref.WeakKeyDictionary()
+
+
+def _async_client_and_slots():
+    loop = asyncio.get_running_loop()
+    state = _async_state.get(loop)
+    if state is None:
+        if backend_name() == "fake":
+            client = FakeBackend(latency_seconds=settings.LLM_FAKE_LATENCY_MS / 1000)
+        else:
+            options = _client_options()
+            http_client = openai.DefaultAsyncHttpxClient(limits=_connection_limits(), timeout=options["timeout"])
+            client = openai.AsyncOpenAI(http_client=http_client, **options)
+        state = (client, asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY))
+        _async_state[loop] = state
+    return state
+
+
+def reset_client() -> None:
+    """Drop the shared clients and concurrency limits so they are rebuilt from current settings."""
+    global _client, _slots
+    with _client_lock:
+        if _client is not None and hasattr(_client, "close"):
+            _client.close()
+        _client = None
+        _slots = None
+        _async_state.clear()
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2**attempt)]."""
+    ceiling = min(settings.LLM_RETRY_MAX_DELAY_SECONDS, settings.LLM_RETRY_BASE_DELAY_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def _retry_after(exc: openai.APIStatusError) -> Optional[float]:
+    headers = exc.response.headers
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return float(headers[name]) * scale
+        except (KeyError, ValueError):
+            continue
+    return None
+
+
+def retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying after ``exc`` on ``attempt``, or None to give up now."""
+    if attempt >= settings.LLM_MAX_RETRIES:
+        return None
+    if isinstance(exc, openai.RateLimitError):
+        if exc.code == "insufficient_quota":
+            return None  # out of credit: permanent until someone pays, don't hold a slot for it
+        wait = _retry_after(exc)
+        if wait is not None:
+            # Waiting longer than we would ever back off only keeps the slot busy.
+            return wait if wait <= settings.LLM_RETRY_MAX_DELAY_SECONDS else None
+    return backoff_delay(attempt)
+
+
+class _GuardedStream:
+    """Streaming response that holds a concurrency slot until it is exhausted or closed.
+
+    On close it records the usage OpenAI sends in the last chunk, or an estimate when the
+    stream was cut short before that chunk arrived.
+    """
+
+    def __init__(self, stream, slots: threading.BoundedSemaphore, user_id: Optional[int], messages: List[dict]):
+        self._stream = stream
+        self._slots = slots
+        self._user_id = user_id
+        self._messages = messages
+        self._content = []
+        self._usage = None
+        self._released = False
+
+    def __iter__(self):
+        try:
+            for chunk in self._stream:
+                if getattr(chunk, "usage", None) is not None:
+                    self._usage = chunk.usage
+                if chunk.choices:
+                    self._content.append(chunk.choices[0].delta.content or "")
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        try:
+            if hasattr(self._stream, "close"):
+                self._stream.close()
+        finally:
+            self._slots.release()
+        _record_usage(self._user_id, self._usage or estimate_usage(self._messages, "".join(self._content)))
+
+
+def chat_completion(
+    *,
+    purpose: str,
+    messages: List[dict],
+    max_tokens: int,
+    temperature: float = 0.7,
+    stream: bool = False,
+    user_id: Optional[int] = None,
+):
+    """Run one chat completion against the configured backend.
+
+    ``purpose`` is one of the ``PURPOSE_*`` constants; the fake backend uses it to shape its
+    answer. The tokens spent are added to ``user_id``'s usage. With ``stream=True`` the
+    returned object is an iterable of chunks that must be exhausted or ``close()``-d to give
+    back its concurrency slot.
+    """
+    slots = _concurrency_slots()
+    if not slots.acquire(timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS):
+        raise LLMOverloaded("Too many concurrent LLM requests.")
+
+    client = get_client()
+    handed_off = False
+    try:
+        attempt = 0
+        while True:
+            try:
+                if isinstance(client, FakeBackend):
+                    response = client.create(purpose=purpose, messages=messages, stream=stream)
+                else:
+                    response = client.chat.completions.create(
+                        model=settings.OPENAI_MODEL_NAME,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        stream=stream,
+                        # Ask for a final chunk carrying the usage of the whole stream.
+                        stream_options={"include_usage": True} if stream else openai.NOT_GIVEN,
+                    )
+                break
+            except RETRYABLE_ERRORS as exc:
+                delay = retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+                logger.warning("LLM %s call failed (%s); retry %d in %.2fs", purpose, exc.__class__.__name__, attempt + 1, delay)
+                time.sleep(delay)
+                attempt += 1
+
+        if stream:
+            handed_off = True
+            return _GuardedStream(response, slots, user_id, messages)
+    finally:
+        if not handed_off:
+            slots.release()
+    _record_usage(user_id, getattr(response, "usage", None))
+    return response
+
+
+async def achat_completion(
+    *, purpose: str, messages: List[dict], max_tokens: int, temperature: float = 0.7, user_id: Optional[int] = None
+):
+    """Async counterpart of :func:`chat_completion` (no streaming) backed by ``AsyncOpenAI``."""
+    client, slots = _async_client_and_slots()
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        raise LLMOverloaded("Too many concurrent LLM requests.") from None
+
+    try:
+        attempt = 0
+        while True:
+            try:
+                if isinstance(client, FakeBackend):
+                    response = await client.acreate(purpose=purpose, messages=messages)
+                else:
+                    response = await client.chat.completions.create(
+                        model=settings.OPENAI_MODEL_NAME,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                    )
+                break
+            except RETRYABLE_ERRORS as exc:
+                delay = retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+                logger.warning("LLM %s call failed (%s); retry %d in %.2fs", purpose, exc.__class__.__name__, attempt + 1, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+    finally:
+        slots.release()
+    await sync_to_async(_record_usage)(user_id, getattr(response, "usage", None))
+    return response
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from trainer.models import ArchivedSession, Exercise, Session
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact sessions older than --days into ArchivedSession rows. Their exercises are "
+        "deleted; progress totals and practice days are preserved."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.SESSION_ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        latest_per_user = Session.objects.filter(user=OuterRef("user")).order_by("-date").values("id")[:1]
+        # A user's latest session is the one generate/ may still append to; never archive it.
+        candidates = (
+            Session.objects.filter(date__lt=cutoff)
+            .exclude(id=Subquery(latest_per_user))
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+        if options["dry_run"]:
+            sessions = candidates.count()
+            exercises = Exercise.objects.filter(session__id__in=candidates).count()
+            self.stdout.write(f"Would archive {sessions} session(s) and {exercises} exercise(s).")
+            return
+
+        sessions = exercises = 0
+        while True:
+            batch = list(candidates[: options["batch_size"]])
+            if not batch:
+                break
+            exercises += self._archive(batch)
+            sessions += len(batch)
+        self.stdout.write(f"Archived {sessions} session(s) and {exercises} exercise(s).")
+
+    def _archive(self, session_ids) -> int:
+        """Summarise and delete the given sessions; returns the number of exercises removed."""
+        with transaction.atomic():
+            rows = (
+                Session.objects.filter(id__in=session_ids)
+                .annotate(
+                    exercises_total=Count("exercises"),
+                    attempts_total=Count("exercises", filter=~Q(exercises__user_translation="")),
+                    correct_total=Count(
+                        "exercises", filter=~Q(exercises__user_translation="") & Q(exercises__is_correct=True)
+                    ),
+                )
+                .values("id", "user_id", "date", "exercises_total", "attempts_total", "correct_total")
+            )
+            ArchivedSession.objects.bulk_create(
+                [
+                    ArchivedSession(
+                        user_id=row["user_id"],
+                        date=row["date"],
+                        exercises_total=row["exercises_total"],
+                        attempts_total=row["attempts_total"],
+                        correct_total=row["correct_total"],
+                    )
+                    for row in rows
+                ]
+            )
+            _, per_model = Exercise.objects.filter(session__id__in=session_ids).delete()
+            Session.objects.filter(id__in=session_ids).delete()
+        return per_model.get(Exercise._meta.label, 0)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from trainer.matching import normalize_for_match
+from trainer.models import Word
+
+
+class Command(BaseCommand):
+    help = "Recompute Word.normalized_text for rows where it is missing or stale."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--user", type=int, help="Only backfill words of this user id.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        words = Word.objects.only("id", "text", "normalized_text").order_by("id")
+        if options.get("user"):
+            words = words.filter(user_id=options["user"])
+
+        scanned = updated = 0
+        stale = []
+        for word in words.iterator(chunk_size=batch_size):
+            scanned += 1
+            normalized = normalize_for_match(word.text)
+            if word.normalized_text == normalized:
+                continue
+            word.normalized_text = normalized
+            stale.append(word)
+            if len(stale) >= batch_size:
+                Word.objects.bulk_update(stale, ["normalized_text"])
+                updated += len(stale)
+                stale = []
+        if stale:
+            Word.objects.bulk_update(stale, ["normalized_text"])
+            updated += len(stale)
+
+        self.stdout.write(f"Scanned {scanned} word(s), updated {updated}.")
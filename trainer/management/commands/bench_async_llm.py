@@ -0,0 +1,191 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+from rest_framework.authtoken.models import Token
+
+from trainer import llm, quota
+
+BENCH_EMAIL = "bench-async-llm@example.invalid"
+
+
+class StubLLMServer:
+    """Minimal OpenAI-compatible HTTP/1.1 server that answers every POST after a fixed delay.
+
+    Runs its own event loop on a daemon thread so it never competes with the code under test.
+    """
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._server = None
+        self._connections = set()
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", 0, backlog=1024)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value.strip())
+                if length:
+                    await reader.readexactly(length)
+                await asyncio.sleep(self.latency_seconds)
+                body = json.dumps(
+                    {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": "stub",
+                        "choices": [
+                            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Stub answer."}}
+                        ],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+                    }
+                ).encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+
+def _summary(latencies, wall):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return len(latencies) / wall, statistics.median(latencies), p95
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrency scaling of the sync chat/ view (fixed worker pool) and the async "
+        "async/chat/ view against a local stub LLM server. Creates and removes a throwaway user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--latency-ms", type=int, default=500, help="Stub LLM response time.")
+        parser.add_argument("--levels", default="1,10,50,100,200", help="Comma-separated concurrency levels.")
+        parser.add_argument("--sync-workers", type=int, default=4, help="Threads standing in for WSGI workers.")
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options["levels"].split(",") if level.strip()]
+        server = StubLLMServer(options["latency_ms"] / 1000)
+        server.start()
+
+        overrides = {
+            "LLM_BACKEND": "openai",
+            "OPENAI_API_KEY": "bench",
+            "OPENAI_BASE_URL": server.base_url,
+            "LLM_MAX_CONCURRENCY": max(levels),
+            "LLM_MAX_CONNECTIONS": max(levels),
+            "LLM_MAX_RETRIES": 0,
+            # The benchmark sends far more requests than one user may; measure without the limits.
+            "LLM_USER_RATE_PER_MINUTE": 0,
+            "LLM_GLOBAL_RATE_PER_MINUTE": 0,
+            "LLM_USER_DAILY_TOKENS": 0,
+            "LLM_GLOBAL_DAILY_TOKENS": 0,
+        }
+        saved = {name: getattr(settings, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        llm.reset_client()
+        saved_buckets, quota.buckets = quota.buckets, quota.LocalBuckets()
+
+        User = get_user_model()
+        User.objects.filter(username=BENCH_EMAIL).delete()
+        user = User.objects.create_user(username=BENCH_EMAIL, email=BENCH_EMAIL, password=None)
+        token = Token.objects.create(user=user)
+        try:
+            self.stdout.write(f"stub latency {options['latency_ms']} ms, {options['sync_workers']} sync workers")
+            self.stdout.write(f"{'mode':<6} {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+            for level in levels:
+                for mode, runner in (("sync", self._run_sync), ("async", self._run_async)):
+                    rps, p50, p95 = runner(token.key, level, options["sync_workers"])
+                    self.stdout.write(f"{mode:<6} {level:>5} {rps:>9.1f} {p50 * 1000:>9.0f} {p95 * 1000:>9.0f}")
+        finally:
+            user.delete()
+            server.stop()
+            for name, value in saved.items():
+                setattr(settings, name, value)
+            llm.reset_client()
+            quota.buckets = saved_buckets
+
+    @staticmethod
+    def _run_sync(token_key, concurrency, workers):
+        def one(_):
+            client = Client(HTTP_AUTHORIZATION=f"Token {token_key}")
+            started = time.perf_counter()
+            response = client.post("/api/chat/", {"message": "hola"}, content_type="application/json")
+            assert response.status_code == 200, response.content
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            latencies = list(pool.map(one, range(concurrency)))
+        return _summary(latencies, time.perf_counter() - started)
+
+    @staticmethod
+    def _run_async(token_key, concurrency, workers):
+        async def run():
+            client = AsyncClient()
+            headers = {"Authorization": f"Token {token_key}"}
+
+            async def one():
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/async/chat/", {"message": "hola"}, content_type="application/json", headers=headers
+                )
+                assert response.status_code == 200, response.content
+                return time.perf_counter() - started
+
+            started = time.perf_counter()
+            latencies = await asyncio.gather(*(one() for _ in range(concurrency)))
+            return _summary(latencies, time.perf_counter() - started)
+
+        return asyncio.run(run())
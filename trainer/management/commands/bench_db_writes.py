@@ -0,0 +1,117 @@
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+
+from trainer.models import Exercise, UserStats
+
+MODES = ("default", "tuned")
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent write load against throwaway SQLite files, once with Django's default "
+        "SQLite settings and once with SQLITE_TUNED_OPTIONS (WAL, synchronous=NORMAL, "
+        "busy_timeout, mmap, IMMEDIATE transactions). The configured database is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8, help="Threads writing concurrently.")
+        parser.add_argument("--readers", type=int, default=4, help="Threads reading while the writers run.")
+        parser.add_argument("--ops", type=int, default=200, help="Write transactions per writer.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['writers']} writers x {options['ops']} transactions, {options['readers']} readers")
+        self.stdout.write(f"{'mode':<8} {'writes/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'failed':>7} {'reads/s':>9}")
+        with tempfile.TemporaryDirectory() as directory:
+            for mode in MODES:
+                alias = f"bench_{mode}"
+                path = os.path.join(directory, f"{mode}.sqlite3")
+                self._add_database(alias, path, settings.SQLITE_TUNED_OPTIONS if mode == "tuned" else {})
+                try:
+                    user_ids = self._create_schema(alias, options["writers"])
+                    row = self._run(alias, user_ids, options["readers"], options["ops"])
+                finally:
+                    connections[alias].close()
+                    del connections[alias]
+                    del connections.settings[alias]
+                writes, p50, p95, failed, reads = row
+                self.stdout.write(f"{mode:<8} {writes:>9.0f} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f} {failed:>7} {reads:>9.0f}")
+
+    def _add_database(self, alias, path, sqlite_options):
+        config = dict(connections["default"].settings_dict)
+        config.update(ENGINE="django.db.backends.sqlite3", NAME=path, OPTIONS=dict(sqlite_options), CONN_MAX_AGE=0)
+        connections.settings[alias] = config
+
+    def _create_schema(self, alias, users):
+        User = get_user_model()
+        with connections[alias].schema_editor() as editor:
+            for model in (User, UserStats, Exercise):
+                editor.create_model(model)
+        # bulk_create skips post_save, whose handlers would write to the default database.
+        created = User.objects.using(alias).bulk_create([User(username=f"bench{n}") for n in range(users)])
+        UserStats.objects.using(alias).bulk_create([UserStats(user_id=user.id) for user in created])
+        return [user.id for user in created]
+
+    def _run(self, alias, user_ids, readers, ops):
+        latencies = []
+        failures = []
+        reads = []
+        stop = threading.Event()
+
+        def write(user_id):
+            # Shaped like generate/ + check/: insert an exercise, then read and bump the
+            # user's counters in the same transaction (see trainer.stats).
+            try:
+                for n in range(ops):
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic(using=alias):
+                            Exercise.objects.using(alias).create(user_id=user_id, sentence=f"Frase {n}")
+                            UserStats.objects.using(alias).filter(user_id=user_id).first()
+                            UserStats.objects.using(alias).filter(user_id=user_id).update(
+                                exercises_total=F("exercises_total") + 1
+                            )
+                    except OperationalError:  # "database is locked" after the busy timeout
+                        failures.append(1)
+                        continue
+                    latencies.append(time.perf_counter() - started)
+            finally:
+                connections[alias].close()
+
+        def read():
+            count = 0
+            try:
+                while not stop.is_set():
+                    try:
+                        list(Exercise.objects.using(alias).order_by("-id").values_list("id", flat=True)[:20])
+                        count += 1
+                    except OperationalError:
+                        pass
+            finally:
+                reads.append(count)
+                connections[alias].close()
+
+        writer_threads = [threading.Thread(target=write, args=(user_id,)) for user_id in user_ids]
+        reader_threads = [threading.Thread(target=read) for _ in range(readers)]
+        started = time.perf_counter()
+        for thread in reader_threads + writer_threads:
+            thread.start()
+        for thread in writer_threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        for thread in reader_threads:
+            thread.join()
+
+        latencies.sort()
+        p50 = statistics.median(latencies) if latencies else 0.0
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)] if latencies else 0.0
+        return len(latencies) / elapsed, p50, p95, len(failures), sum(reads) / elapsed
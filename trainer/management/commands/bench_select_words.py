@@ -0,0 +1,75 @@
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from trainer import review, sampling
+from trainer.models import Word
+
+BENCH_EMAIL = "bench-select-words@example.invalid"
+LANGUAGE = "Spanish"
+RECENT = 5
+
+
+def _shuffle_all(user_id, language, count, exclude_ids):
+    """The selection generate/ used to do: load every word, shuffle, skip the recent ones."""
+    words = list(Word.objects.filter(user_id=user_id, language=language))
+    random.shuffle(words)
+    selected = [w for w in words if w.id not in exclude_ids][:count]
+    if len(selected) < count:
+        selected += [w for w in words if w.id in exclude_ids][: count - len(selected)]
+    return selected
+
+
+STRATEGIES = (
+    ("shuffle-all", _shuffle_all),
+    ("random", sampling.random_words),
+    ("review", review.due_words),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency and peak Python memory of picking words for generate/ from a large "
+        "dictionary. Creates and removes a throwaway user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--words", type=int, default=100_000, help="Dictionary size.")
+        parser.add_argument("--count", type=int, default=20, help="Words picked per call.")
+        parser.add_argument("--runs", type=int, default=30)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        User.objects.filter(username=BENCH_EMAIL).delete()
+        user = User.objects.create_user(username=BENCH_EMAIL, email=BENCH_EMAIL, password=None)
+        try:
+            Word.objects.bulk_create(
+                [Word(user=user, text=f"palabra{n}", language=LANGUAGE) for n in range(options["words"])],
+                batch_size=2000,
+            )
+            ids = list(Word.objects.filter(user=user).values_list("id", flat=True))
+            self.stdout.write(f"{options['words']} words, {options['count']} per pick, {options['runs']} runs")
+            self.stdout.write(f"{'strategy':<12} {'p50 ms':>9} {'p95 ms':>9} {'peak KiB':>10}")
+            for name, pick in STRATEGIES:
+                timings = []
+                for _ in range(options["runs"]):
+                    recent = set(random.sample(ids, RECENT))
+                    started = time.perf_counter()
+                    picked = pick(user.id, LANGUAGE, options["count"], recent)
+                    timings.append(time.perf_counter() - started)
+                    assert len(picked) == options["count"] and not recent & {w.id for w in picked}
+                # Measured in a separate call: tracing allocations slows the code down a lot.
+                tracemalloc.start()
+                pick(user.id, LANGUAGE, options["count"], set(random.sample(ids, RECENT)))
+                peak = tracemalloc.get_traced_memory()[1] / 1024
+                tracemalloc.stop()
+                timings.sort()
+                p50 = statistics.median(timings)
+                p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+                self.stdout.write(f"{name:<12} {p50 * 1000:>9.2f} {p95 * 1000:>9.2f} {peak:>10.0f}")
+        finally:
+            user.delete()
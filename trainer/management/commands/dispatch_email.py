@@ -0,0 +1,31 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from trainer import outbox
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the outbox over one reused connection, retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep running, sleeping --interval seconds between passes.")
+        parser.add_argument("--interval", type=float, default=5.0)
+        parser.add_argument("--purge-sent-days", type=int, default=7, help="Delete sent emails older than this.")
+
+    def handle(self, *args, **options):
+        while True:
+            counts = outbox.drain()
+            if any(counts.values()):
+                self.stdout.write(
+                    f"Sent {counts['sent']}, will retry {counts['retried']}, gave up on {counts['dead']} email(s)."
+                )
+            purged = outbox.purge_sent(timedelta(days=options["purge_sent_days"]))
+            if purged:
+                self.stdout.write(f"Purged {purged} sent email(s).")
+            if not options["loop"]:
+                break
+            close_old_connections()
+            time.sleep(options["interval"])
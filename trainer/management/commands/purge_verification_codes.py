@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from trainer.models import VerificationCode
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete verification codes that are used or expired, in batches. Run it periodically "
+        "(e.g. hourly from cron); codes younger than --keep-hours are left alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-hours", type=int, default=24)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        cutoff = now - timedelta(hours=options["keep_hours"])
+        candidates = (
+            VerificationCode.objects.filter(Q(is_used=True) | Q(expires_at__lt=now), created_at__lt=cutoff)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(f"Would delete {candidates.count()} verification code(s).")
+            return
+
+        deleted = 0
+        while True:
+            batch = list(candidates[: options["batch_size"]])
+            if not batch:
+                break
+            count, _ = VerificationCode.objects.filter(id__in=batch).delete()
+            deleted += count
+        self.stdout.write(f"Deleted {deleted} verification code(s).")
@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from trainer import stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized UserStats rows from words, exercises and sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only rebuild this user id.")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("id").values_list("id", flat=True)
+        if options.get("user"):
+            users = users.filter(id=options["user"])
+
+        rebuilt = 0
+        for user_id in users.iterator():
+            stats.rebuild(user_id)
+            rebuilt += 1
+        self.stdout.write(f"Rebuilt stats for {rebuilt} user(s).")
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from trainer import llm, pool
+from trainer.models import SentencePoolBucket
+
+
+class Command(BaseCommand):
+    help = "Evict stale pooled sentences and refill sentence-pool buckets below their low-water mark."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep running, sleeping --interval seconds between passes.")
+        parser.add_argument("--interval", type=float, default=30.0)
+        parser.add_argument("--user", type=int, help="Only refill buckets of this user id.")
+
+    def handle(self, *args, **options):
+        if not llm.is_enabled():
+            self.stderr.write("No LLM backend is configured (OPENAI_API_KEY / LLM_BACKEND); nothing to pre-generate.")
+            return
+
+        while True:
+            self._pass(options.get("user"))
+            if not options["loop"]:
+                break
+            close_old_connections()
+            time.sleep(options["interval"])
+
+    def _pass(self, user_id):
+        buckets_deleted, sentences_deleted = pool.evict()
+        if buckets_deleted or sentences_deleted:
+            self.stdout.write(f"Evicted {buckets_deleted} idle bucket(s) and {sentences_deleted} sentence(s).")
+
+        buckets = SentencePoolBucket.objects.order_by("-last_requested_at")
+        if user_id:
+            buckets = buckets.filter(user_id=user_id)
+        for bucket in buckets.iterator():
+            if not pool.needs_refill(bucket):
+                continue
+            try:
+                added = pool.refill(bucket)
+            except Exception as exc:  # keep the worker alive; the next pass retries
+                self.stderr.write(f"Bucket {bucket.id}: refill failed: {exc}")
+                continue
+            self.stdout.write(f"Bucket {bucket.id}: added {added} sentence(s).")
@@ -0,0 +1,116 @@
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+def normalize_for_match(text: str) -> str:
+    """Fold case, accents and punctuation so vocabulary and sentences compare loosely."""
+    # Remove accents
+    text = unicodedata.normalize("NFD", text)
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+    # Lowercase and replace punctuation with spaces
+    text = text.lower()
+    text = "".join(ch if ch.isalnum() else " " for ch in text)
+    # Collapse whitespace
+    return " ".join(text.split())
+
+
+class _PhraseAutomaton:
+    """Aho–Corasick automaton over the characters of normalized phrases.
+
+    ``search`` reports every phrase occurring anywhere in the text in a single pass.
+    """
+
+    def __init__(self, phrases: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for idx, phrase in enumerate(phrases):
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = nxt
+            self._out[state].add(idx)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def search(self, text: str) -> Set[int]:
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            if self._out[state]:
+                found |= self._out[state]
+        return found
+
+
+class VocabularyMatcher:
+    """Precompiled matcher for one vocabulary list.
+
+    Single words are looked up in the sentence's token set; multi-word phrases are found
+    with one Aho–Corasick pass over the normalized sentence. Results keep the order (and
+    duplicates) of the original list, exactly like the per-word loop it replaces.
+    """
+
+    def __init__(self, word_list: Sequence[str], normalized: Sequence[str] = None):
+        if normalized is None:
+            normalized = [normalize_for_match(raw) for raw in word_list]
+
+        phrases: List[str] = []
+        phrase_ids: Dict[str, int] = {}
+        # (raw word, normalized single word or None, phrase id or None)
+        self._entries: List[Tuple[str, str, int]] = []
+        for raw, norm in zip(word_list, normalized):
+            if not norm:
+                continue
+            if " " not in norm:
+                self._entries.append((raw, norm, None))
+                continue
+            if norm not in phrase_ids:
+                phrase_ids[norm] = len(phrases)
+                phrases.append(norm)
+            self._entries.append((raw, None, phrase_ids[norm]))
+
+        self._automaton = _PhraseAutomaton(phrases) if phrases else None
+
+    def find(self, sentence: str) -> List[str]:
+        normalized_sentence = normalize_for_match(sentence)
+        if not normalized_sentence:
+            return []
+
+        tokens = set(normalized_sentence.split())
+        phrase_hits = self._automaton.search(normalized_sentence) if self._automaton else set()
+
+        found: List[str] = []
+        for raw, word, phrase_id in self._entries:
+            if (word is not None and word in tokens) or (phrase_id is not None and phrase_id in phrase_hits):
+                found.append(raw)
+        return found
+
+
+@lru_cache(maxsize=256)
+def get_matcher(word_list: Tuple[str, ...], normalized: Tuple[str, ...] = None) -> VocabularyMatcher:
+    """Matcher for ``word_list``, compiled once per distinct vocabulary and reused after that.
+
+    ``normalized`` may carry the already-normalized forms (``Word.normalized_text``).
+    """
+    return VocabularyMatcher(word_list, normalized)
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0005_profile_bio_profile_learning_goal'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationVerdict',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(max_length=64, unique=True)),
+                ('language_direction', models.CharField(max_length=20)),
+                ('model_name', models.CharField(max_length=100)),
+                ('verdict', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
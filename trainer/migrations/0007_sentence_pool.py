@@ -0,0 +1,53 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0006_translationverdict'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentencePoolBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('source_language', models.CharField(max_length=50)),
+                ('target_language', models.CharField(max_length=50)),
+                ('level', models.CharField(max_length=20)),
+                ('length', models.CharField(max_length=50)),
+                ('topic', models.CharField(max_length=200)),
+                ('sentence_type', models.CharField(max_length=20)),
+                ('tense', models.CharField(max_length=20)),
+                ('grammar_focus', models.CharField(blank=True, max_length=200)),
+                ('words_count', models.PositiveSmallIntegerField(default=5)),
+                ('last_requested_at', models.DateTimeField(db_index=True)),
+                ('last_refilled_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PooledSentence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sentence', models.TextField()),
+                ('word_ids', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('bucket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sentences', to='trainer.sentencepoolbucket')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='sentencepoolbucket',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='unique_pool_bucket_per_user'),
+        ),
+        migrations.AddIndex(
+            model_name='pooledsentence',
+            index=models.Index(fields=['bucket', 'created_at'], name='trainer_poo_bucket__4a003d_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+from trainer.matching import normalize_for_match
+
+
+def backfill_normalized_text(apps, schema_editor):
+    Word = apps.get_model("trainer", "Word")
+    batch = []
+    for word in Word.objects.only("id", "text").iterator(chunk_size=2000):
+        word.normalized_text = normalize_for_match(word.text)
+        batch.append(word)
+        if len(batch) >= 2000:
+            Word.objects.bulk_update(batch, ["normalized_text"])
+            batch = []
+    if batch:
+        Word.objects.bulk_update(batch, ["normalized_text"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0007_sentence_pool'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='normalized_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=600),
+        ),
+        migrations.RunPython(backfill_normalized_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['user', 'normalized_text'], name='trainer_word_user_norm_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:16
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+from django.db.models.functions import Lower
+
+
+def merge_case_duplicates(apps, schema_editor):
+    """Fold words that differ only by case into the oldest one, keeping exercise links."""
+    Word = apps.get_model("trainer", "Word")
+    Through = apps.get_model("trainer", "Exercise").words_used.through
+
+    groups = (
+        Word.objects.annotate(lower_text=Lower("text"), lower_language=Lower("language"))
+        .values("user_id", "lower_text", "lower_language")
+        .annotate(rows=Count("id"), keep_id=Min("id"))
+        .filter(rows__gt=1)
+    )
+    for group in groups:
+        duplicate_ids = list(
+            Word.objects.annotate(lower_text=Lower("text"), lower_language=Lower("language"))
+            .filter(
+                user_id=group["user_id"],
+                lower_text=group["lower_text"],
+                lower_language=group["lower_language"],
+            )
+            .exclude(id=group["keep_id"])
+            .values_list("id", flat=True)
+        )
+        linked = set(Through.objects.filter(word_id=group["keep_id"]).values_list("exercise_id", flat=True))
+        moved = set(
+            Through.objects.filter(word_id__in=duplicate_ids).exclude(exercise_id__in=linked).values_list("exercise_id", flat=True)
+        )
+        Through.objects.bulk_create([Through(exercise_id=exercise_id, word_id=group["keep_id"]) for exercise_id in moved])
+        Word.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0008_word_normalized_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='word',
+            name='unique_word_per_user',
+        ),
+        migrations.RunPython(merge_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='word',
+            constraint=models.UniqueConstraint(models.F('user'), django.db.models.functions.text.Lower('text'), django.db.models.functions.text.Lower('language'), name='unique_word_per_user_ci'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0009_word_unique_case_insensitive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word_id', models.BigIntegerField()),
+                ('revision', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='revision',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='word',
+            name='revision',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['user', 'revision'], name='trainer_word_user_rev_idx'),
+        ),
+        migrations.AddField(
+            model_name='wordtombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='wordtombstone',
+            index=models.Index(fields=['user', 'revision'], name='trainer_wor_user_id_a2e93e_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0010_word_revisions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateTimeField()),
+                ('exercises_total', models.PositiveIntegerField(default=0)),
+                ('attempts_total', models.PositiveIntegerField(default=0)),
+                ('correct_total', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['user', '-date'], name='trainer_session_user_date_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedsession',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedsession',
+            index=models.Index(fields=['user', 'date'], name='trainer_arc_user_id_cb0162_idx'),
+        ),
+    ]
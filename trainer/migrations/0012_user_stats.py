@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('trainer', '0011_session_rollover'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('words_total', models.IntegerField(default=0)),
+                ('exercises_total', models.IntegerField(default=0)),
+                ('attempts_total', models.IntegerField(default=0)),
+                ('correct_total', models.IntegerField(default=0)),
+                ('sessions_total', models.IntegerField(default=0)),
+                ('days_practiced', models.IntegerField(default=0)),
+                ('current_run', models.IntegerField(default=0)),
+                ('longest_streak', models.IntegerField(default=0)),
+                ('last_practice_date', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:26
+
+import django.db.models.deletion
+from django.conf import settings
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.utils import timezone
+
+
+def backfill_from_sessions(apps, schema_editor):
+    """Seed activity from session dates; each session's counts land on its last day."""
+    Session = apps.get_model("trainer", "Session")
+    ArchivedSession = apps.get_model("trainer", "ArchivedSession")
+    DailyActivity = apps.get_model("trainer", "DailyActivity")
+
+    days = defaultdict(lambda: [0, 0, 0])
+    sessions = Session.objects.annotate(
+        exercises_total=Count("exercises"),
+        attempts_total=Count("exercises", filter=~Q(exercises__user_translation="")),
+        correct_total=Count("exercises", filter=~Q(exercises__user_translation="") & Q(exercises__is_correct=True)),
+    ).values_list("user_id", "date", "exercises_total", "attempts_total", "correct_total")
+    archived = ArchivedSession.objects.values_list("user_id", "date", "exercises_total", "attempts_total", "correct_total")
+    for rows in (sessions, archived):
+        for user_id, dt, exercises, attempts, correct in rows.iterator():
+            counts = days[(user_id, timezone.localtime(dt).date())]
+            # A session with no exercises still marked a practice day before this table existed.
+            counts[0] += max(exercises, 1)
+            counts[1] += attempts
+            counts[2] += correct
+
+    DailyActivity.objects.bulk_create(
+        [
+            DailyActivity(
+                user_id=user_id,
+                date=day,
+                day_number=day.toordinal(),
+                exercises=exercises,
+                attempts=attempts,
+                correct=correct,
+            )
+            for (user_id, day), (exercises, attempts, correct) in days.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0012_user_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('day_number', models.IntegerField()),
+                ('exercises', models.IntegerField(default=0)),
+                ('attempts', models.IntegerField(default=0)),
+                ('correct', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'date'), name='unique_daily_activity_per_user')],
+            },
+        ),
+        migrations.RunPython(backfill_from_sessions, migrations.RunPython.noop),
+    ]
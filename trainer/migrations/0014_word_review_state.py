@@ -0,0 +1,50 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def create_review_states(apps, schema_editor):
+    """Every existing word starts its schedule due now."""
+    Word = apps.get_model("trainer", "Word")
+    WordReviewState = apps.get_model("trainer", "WordReviewState")
+    now = timezone.now()
+    batch = []
+    for word_id, user_id, language in Word.objects.values_list("id", "user_id", "language").iterator():
+        batch.append(WordReviewState(word_id=word_id, user_id=user_id, language=language, due_at=now))
+        if len(batch) >= 1000:
+            WordReviewState.objects.bulk_create(batch)
+            batch = []
+    WordReviewState.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0013_daily_activity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordReviewState',
+            fields=[
+                ('word', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review', serialize=False, to='trainer.word')),
+                ('language', models.CharField(max_length=50)),
+                ('ease', models.FloatField(default=2.5)),
+                ('interval_days', models.PositiveIntegerField(default=0)),
+                ('repetitions', models.PositiveIntegerField(default=0)),
+                ('lapses', models.PositiveIntegerField(default=0)),
+                ('due_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'language', 'due_at'], name='trainer_review_due_idx')],
+            },
+        ),
+        migrations.RunPython(create_review_states, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0014_word_review_state'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['user', 'language', 'id'], name='trainer_word_user_lang_idx'),
+        ),
+    ]
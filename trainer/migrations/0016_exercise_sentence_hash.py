@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:43
+
+import hashlib
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_sentence_hash(apps, schema_editor):
+    Exercise = apps.get_model("trainer", "Exercise")
+    batch = []
+    for exercise in Exercise.objects.only("id", "sentence").iterator(chunk_size=2000):
+        exercise.sentence_hash = hashlib.sha256(exercise.sentence.encode("utf-8")).hexdigest()
+        batch.append(exercise)
+        if len(batch) >= 2000:
+            Exercise.objects.bulk_update(batch, ["sentence_hash"])
+            batch = []
+    if batch:
+        Exercise.objects.bulk_update(batch, ["sentence_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0015_word_user_language_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='sentence_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_sentence_hash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['user', 'sentence_hash', '-id'], name='trainer_exercise_user_hash_idx'),
+        ),
+    ]
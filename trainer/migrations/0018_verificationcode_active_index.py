@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0017_email_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='verificationcode',
+            name='trainer_ver_user_id_c68491_idx',
+        ),
+        migrations.AddIndex(
+            model_name='verificationcode',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['user', 'purpose', 'expires_at'], name='trainer_vcode_active_idx'),
+        ),
+    ]
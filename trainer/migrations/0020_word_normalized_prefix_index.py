@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 03:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainer', '0019_llmusage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='word',
+            name='trainer_word_user_norm_idx',
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=models.Index(fields=['user', 'normalized_text'], name='trainer_word_norm_prefix_idx', opclasses=['', 'varchar_pattern_ops']),
+        ),
+    ]
@@ -1,5 +1,13 @@
+import hashlib
+from collections import defaultdict
+
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .matching import normalize_for_match
 
 User = get_user_model()
 
@@ -13,10 +21,42 @@ class Profile(models.Model):
     target_language = models.CharField(max_length=50, default="Spanish")
     bio = models.TextField(blank=True, max_length=500)
     learning_goal = models.CharField(max_length=100, blank=True, default="Fluency")
+    # Per-user change counter for delta sync: every Word or Profile change takes the next value.
+    revision = models.BigIntegerField(default=0, editable=False)
 
     def __str__(self) -> str:  # pragma: no cover
         return f"Profile for {self.user}" 
 
+    def save(self, *args, **kwargs):
+        # Never write ``revision`` from a possibly stale instance; it only moves through
+        # reserve_revisions().
+        if self.pk is not None and not kwargs.get("force_insert"):
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                update_fields = [f.name for f in self._meta.concrete_fields if not f.primary_key]
+            kwargs["update_fields"] = [name for name in update_fields if name != "revision"]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.revision = Profile.reserve_revisions(self.user_id)
+
+    @staticmethod
+    def reserve_revisions(user_id: int, count: int = 1) -> int:
+        """Advance the user's revision by ``count`` and return the new (highest) value.
+
+        Must run inside the transaction that makes the change: the row lock taken by the
+        UPDATE keeps concurrent writers of the same user in commit order.
+        """
+        with transaction.atomic():
+            updated = Profile.objects.filter(user_id=user_id).update(revision=F("revision") + count)
+            if not updated:
+                Profile.objects.get_or_create(user_id=user_id)
+                Profile.objects.filter(user_id=user_id).update(revision=F("revision") + count)
+            return Profile.objects.filter(user_id=user_id).values_list("revision", flat=True).get()
+
+    @staticmethod
+    def current_revision(user_id: int) -> int:
+        return Profile.objects.filter(user_id=user_id).values_list("revision", flat=True).first() or 0
+
 
 class VerificationCode(models.Model):
     PURPOSE_REGISTRATION = "registration"
@@ -37,43 +77,464 @@ class VerificationCode(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        indexes = [models.Index(fields=["user", "purpose", "is_used", "expires_at"])]
+        indexes = [
+            # Verification only looks for unused codes, which are a handful of rows per user;
+            # used ones are left out of the index and removed by purge_verification_codes.
+            models.Index(
+                fields=["user", "purpose", "expires_at"],
+                condition=models.Q(is_used=False),
+                name="trainer_vcode_active_idx",
+            ),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.purpose} for {self.user}" 
 
 
+def _group_by_user(objs):
+    groups = defaultdict(list)
+    for obj in objs:
+        groups[obj.user_id].append(obj)
+    return groups
+
+
+class WordQuerySet(models.QuerySet):
+    """Keeps ``normalized_text``, revisions and tombstones in sync on bulk writes, which
+    bypass ``Word.save`` / ``Word.delete``."""
+
+    # Changing only these does not alter what clients see.
+    _INTERNAL_FIELDS = {"normalized_text", "revision"}
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.normalized_text = normalize_for_match(obj.text)
+        with transaction.atomic(using=self.db):
+            for user_id, user_objs in _group_by_user(objs).items():
+                last = Profile.reserve_revisions(user_id, len(user_objs))
+                for offset, obj in enumerate(user_objs):
+                    obj.revision = last - len(user_objs) + 1 + offset
+            created = super().bulk_create(objs, *args, **kwargs)
+            WordReviewState.create_for(objs)
+            # Conflicts may have been skipped, so recount instead of adding len(objs).
+            for user_id in {obj.user_id for obj in objs}:
+                UserStats.objects.filter(user_id=user_id).update(
+                    words_total=Word.objects.filter(user_id=user_id).count()
+                )
+            return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        fields = list(fields)
+        objs = list(objs)
+        if "text" in fields:
+            for obj in objs:
+                obj.normalized_text = normalize_for_match(obj.text)
+            if "normalized_text" not in fields:
+                fields.append("normalized_text")
+        if set(fields) - self._INTERNAL_FIELDS:
+            with transaction.atomic(using=self.db):
+                for user_id, user_objs in _group_by_user(objs).items():
+                    revision = Profile.reserve_revisions(user_id)
+                    for obj in user_objs:
+                        obj.revision = revision
+                if "revision" not in fields:
+                    fields.append("revision")
+                updated = super().bulk_update(objs, fields, *args, **kwargs)
+                if "language" in fields:
+                    by_language = defaultdict(list)
+                    for obj in objs:
+                        by_language[obj.language].append(obj.pk)
+                    for language, word_ids in by_language.items():
+                        WordReviewState.objects.filter(word_id__in=word_ids).update(language=language)
+                return updated
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if isinstance(kwargs.get("text"), str):
+            kwargs.setdefault("normalized_text", normalize_for_match(kwargs["text"]))
+        if not set(kwargs) - self._INTERNAL_FIELDS:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            updated = 0
+            for user_id in set(self.values_list("user_id", flat=True)):
+                revision = Profile.reserve_revisions(user_id)
+                updated += super(WordQuerySet, self.filter(user_id=user_id)).update(revision=revision, **kwargs)
+            if "language" in kwargs:
+                WordReviewState.objects.filter(word__in=self).update(language=kwargs["language"])
+            return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            rows = list(self.values_list("id", "user_id"))
+            by_user = defaultdict(list)
+            for word_id, user_id in rows:
+                by_user[user_id].append(word_id)
+            tombstones = []
+            for user_id, word_ids in by_user.items():
+                revision = Profile.reserve_revisions(user_id)
+                tombstones += [WordTombstone(user_id=user_id, word_id=word_id, revision=revision) for word_id in word_ids]
+            WordTombstone.objects.bulk_create(tombstones)
+            for user_id, word_ids in by_user.items():
+                UserStats.objects.filter(user_id=user_id).update(words_total=F("words_total") - len(word_ids))
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class Word(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     text = models.CharField(max_length=200)
     language = models.CharField(max_length=50, default="Spanish")
+    # normalize_for_match(text), stored so sentence matching and the word filters need not recompute it.
+    # NFD decomposition can triple the length of some scripts (Hangul), hence max_length.
+    normalized_text = models.CharField(max_length=600, blank=True, default="", editable=False)
+    # Profile.revision at this word's last change (see Profile.reserve_revisions).
+    revision = models.BigIntegerField(default=0, editable=False)
+
+    objects = WordQuerySet.as_manager()
 
     def __str__(self) -> str:  # pragma: no cover - simple repr
         return self.text
 
+    def save(self, *args, **kwargs):
+        self.normalized_text = normalize_for_match(self.text)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            extra = [name for name in ("normalized_text", "revision") if name not in update_fields]
+            kwargs["update_fields"] = [*update_fields, *extra]
+        adding = self._state.adding
+        with transaction.atomic():
+            self.revision = Profile.reserve_revisions(self.user_id)
+            super().save(*args, **kwargs)
+            if adding:
+                UserStats.objects.filter(user_id=self.user_id).update(words_total=F("words_total") + 1)
+                WordReviewState.create_for([self])
+            elif update_fields is None or "language" in update_fields:
+                WordReviewState.objects.filter(word=self).exclude(language=self.language).update(language=self.language)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            revision = Profile.reserve_revisions(self.user_id)
+            WordTombstone.objects.create(user_id=self.user_id, word_id=self.pk, revision=revision)
+            UserStats.objects.filter(user_id=self.user_id).update(words_total=F("words_total") - 1)
+            return super().delete(*args, **kwargs)
+
     class Meta:
         constraints = [
-            models.UniqueConstraint(fields=["user", "text", "language"], name="unique_word_per_user"),
+            # Case-insensitive, so the duplicate check is an index probe done by the insert itself.
+            models.UniqueConstraint("user", Lower("text"), Lower("language"), name="unique_word_per_user_ci"),
+        ]
+        indexes = [
+            # varchar_pattern_ops lets PostgreSQL answer LIKE 'prefix%' from the index under any
+            # collation ("" keeps user's default opclass); other backends ignore opclasses.
+            models.Index(
+                fields=["user", "normalized_text"],
+                name="trainer_word_norm_prefix_idx",
+                opclasses=["", "varchar_pattern_ops"],
+            ),
+            models.Index(fields=["user", "revision"], name="trainer_word_user_rev_idx"),
+            # Random sampling probes the id range of one language (see trainer.sampling).
+            models.Index(fields=["user", "language", "id"], name="trainer_word_user_lang_idx"),
         ]
 
 
+class WordReviewState(models.Model):
+    """Spaced-repetition schedule of one word, updated by ``trainer.review`` after each check.
+
+    ``user`` and ``language`` are copies of the word's, so picking the next due words is a
+    range scan of the (user, language, due_at) index.
+    """
+
+    word = models.OneToOneField(Word, on_delete=models.CASCADE, primary_key=True, related_name="review")
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    language = models.CharField(max_length=50)
+    ease = models.FloatField(default=2.5)
+    interval_days = models.PositiveIntegerField(default=0)
+    # Correct reviews in a row; reset by a lapse.
+    repetitions = models.PositiveIntegerField(default=0)
+    lapses = models.PositiveIntegerField(default=0)
+    due_at = models.DateTimeField(default=timezone.now)
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "language", "due_at"], name="trainer_review_due_idx")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Review state of word {self.word_id}"
+
+    @classmethod
+    def create_for(cls, words) -> None:
+        """Start the schedule of newly inserted ``words``: due straight away."""
+        now = timezone.now()
+        words = list(words)
+        states = [cls(word_id=w.pk, user_id=w.user_id, language=w.language, due_at=now) for w in words if w.pk]
+        cls.objects.bulk_create(states, ignore_conflicts=True)
+        # bulk_create(ignore_conflicts=True) leaves primary keys unset; find those words by query.
+        for user_id in {w.user_id for w in words if not w.pk}:
+            missing = Word.objects.filter(user_id=user_id, review__isnull=True).values_list("id", "language")
+            cls.objects.bulk_create(
+                [cls(word_id=word_id, user_id=user_id, language=language, due_at=now) for word_id, language in missing],
+                ignore_conflicts=True,
+            )
+
+
+class WordTombstone(models.Model):
+    """Records a deleted Word so ``words/changes/`` can tell clients to drop it."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    word_id = models.BigIntegerField()
+    revision = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "revision"])]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Deleted word {self.word_id} (rev {self.revision})"
+
+
+def sentence_digest(sentence: str) -> str:
+    return hashlib.sha256(sentence.encode("utf-8")).hexdigest()
+
+
+class ExerciseQuerySet(models.QuerySet):
+    """Keeps ``sentence_hash`` in sync on bulk writes, which bypass ``Exercise.save``."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.sentence_hash = sentence_digest(obj.sentence)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        fields = list(fields)
+        if "sentence" in fields:
+            for obj in objs:
+                obj.sentence_hash = sentence_digest(obj.sentence)
+            if "sentence_hash" not in fields:
+                fields.append("sentence_hash")
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if isinstance(kwargs.get("sentence"), str):
+            kwargs.setdefault("sentence_hash", sentence_digest(kwargs["sentence"]))
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+
 class Exercise(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     sentence = models.TextField()
+    # sentence_digest(sentence): an indexable stand-in for the unbounded sentence text.
+    sentence_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
     words_used = models.ManyToManyField(Word)
     user_translation = models.TextField(blank=True)
     correct_translation = models.TextField(blank=True)
     is_correct = models.BooleanField(default=False)
 
+    objects = ExerciseQuerySet.as_manager()
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "sentence_hash", "-id"], name="trainer_exercise_user_hash_idx")]
+
     def __str__(self) -> str:  # pragma: no cover
         return self.sentence[:50]
 
+    def save(self, *args, **kwargs):
+        self.sentence_hash = sentence_digest(self.sentence)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "sentence" in update_fields and "sentence_hash" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "sentence_hash"]
+        super().save(*args, **kwargs)
+
 
 class Session(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     exercises = models.ManyToManyField(Exercise)
+    # Time of the last generation in this session (bumped by generate/).
     date = models.DateTimeField(auto_now_add=True)
     last_words_used = models.JSONField(default=list)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "-date"], name="trainer_session_user_date_idx")]
+
     def __str__(self) -> str:  # pragma: no cover
         return f"Session {self.id} for {self.user}"
+
+
+class UserStats(models.Model):
+    """Progress counters maintained incrementally by ``trainer.stats``.
+
+    ``ProgressView`` reads this single row instead of aggregating the user's history.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    words_total = models.IntegerField(default=0)
+    exercises_total = models.IntegerField(default=0)
+    attempts_total = models.IntegerField(default=0)
+    correct_total = models.IntegerField(default=0)
+    sessions_total = models.IntegerField(default=0)
+    days_practiced = models.IntegerField(default=0)
+    # Consecutive practice days ending at last_practice_date.
+    current_run = models.IntegerField(default=0)
+    longest_streak = models.IntegerField(default=0)
+    last_practice_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Stats for {self.user}"
+
+
+class DailyActivity(models.Model):
+    """One row per user and local calendar day with that day's activity counts.
+
+    ``day_number`` is ``date.toordinal()``, so consecutive days are consecutive integers
+    and streaks reduce to a gaps-and-islands query (see ``trainer.stats``).
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    day_number = models.IntegerField()
+    exercises = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    correct = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date"], name="unique_daily_activity_per_user"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.date} for {self.user}"
+
+
+class ArchivedSession(models.Model):
+    """Counts left behind by a session whose exercises were removed by ``archive_sessions``."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateTimeField()
+    exercises_total = models.PositiveIntegerField(default=0)
+    attempts_total = models.PositiveIntegerField(default=0)
+    correct_total = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "date"])]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Archived session of {self.date:%Y-%m-%d} for {self.user}"
+
+
+class EmailOutbox(models.Model):
+    """An email waiting to be sent by ``trainer.outbox``, or the record of one."""
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_DEAD, "Dead"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    # Pending rows are sent once this has passed; a dispatcher pushes it forward while it
+    # holds a row, and after a failure to schedule the retry.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"], name="trainer_outbox_due_idx")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.subject} to {', '.join(self.to)} ({self.status})"
+
+
+class LLMUsage(models.Model):
+    """Model tokens spent per user and local calendar day, from ``response.usage``.
+
+    The row without a user holds the day's total for everyone, which is what the global
+    budget in ``trainer.quota`` is checked against.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name="llm_usage")
+    date = models.DateField()
+    requests = models.PositiveIntegerField(default=0)
+    prompt_tokens = models.PositiveBigIntegerField(default=0)
+    completion_tokens = models.PositiveBigIntegerField(default=0)
+    total_tokens = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date"], name="unique_llm_usage_per_user"),
+            # NULLs are distinct in unique constraints, so the totals row needs its own.
+            models.UniqueConstraint(fields=["date"], condition=models.Q(user__isnull=True), name="unique_llm_usage_total"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.total_tokens} tokens on {self.date} for {self.user or 'everyone'}"
+
+
+class TranslationVerdict(models.Model):
+    """Shared tier of the translation-check cache (see ``trainer.cache``)."""
+
+    cache_key = models.CharField(max_length=64, unique=True)
+    language_direction = models.CharField(max_length=20)
+    model_name = models.CharField(max_length=100)
+    verdict = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Verdict {self.cache_key[:12]} ({self.language_direction})"
+
+
+class SentencePoolBucket(models.Model):
+    """Pre-generated sentences for one user and one combination of generation options."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    key = models.CharField(max_length=64)
+    source_language = models.CharField(max_length=50)
+    target_language = models.CharField(max_length=50)
+    level = models.CharField(max_length=20)
+    length = models.CharField(max_length=50)
+    topic = models.CharField(max_length=200)
+    sentence_type = models.CharField(max_length=20)
+    tense = models.CharField(max_length=20)
+    grammar_focus = models.CharField(max_length=200, blank=True)
+    words_count = models.PositiveSmallIntegerField(default=5)
+    last_requested_at = models.DateTimeField(db_index=True)
+    last_refilled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="unique_pool_bucket_per_user"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Pool {self.level}/{self.topic}/{self.tense} for {self.user}"
+
+
+class PooledSentence(models.Model):
+    bucket = models.ForeignKey(SentencePoolBucket, on_delete=models.CASCADE, related_name="sentences")
+    sentence = models.TextField()
+    word_ids = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["bucket", "created_at"])]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.sentence[:50]
@@ -0,0 +1,147 @@
+"""Outgoing email queue.
+
+Request handlers only insert an :class:`~trainer.models.EmailOutbox` row. A dispatcher
+(the in-process thread below, or ``manage.py dispatch_email``) sends due rows over a
+single reused mail connection. Failed sends are retried with exponential backoff, and a
+row that keeps failing is marked dead.
+"""
+
+import contextlib
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(subject: str, body: str, to: Iterable[str], from_email: str = "") -> EmailOutbox:
+    """Queue an email; it is sent after the current transaction commits."""
+    row = EmailOutbox.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+    if settings.EMAIL_OUTBOX_IN_PROCESS:
+        transaction.on_commit(dispatcher.wake)
+    return row
+
+
+def _claim(limit: int) -> List[EmailOutbox]:
+    """Take up to ``limit`` due rows, leasing them so other dispatchers skip them meanwhile."""
+    now = timezone.now()
+    due = EmailOutbox.objects.filter(status=EmailOutbox.STATUS_PENDING, next_attempt_at__lte=now)
+    ids = list(due.order_by("next_attempt_at", "id").values_list("id", flat=True)[:limit])
+    if not ids:
+        return []
+    lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    # Only rows still due at update time are ours; a concurrent dispatcher may have won the rest.
+    due.filter(id__in=ids).update(next_attempt_at=lease_until)
+    return list(EmailOutbox.objects.filter(id__in=ids, next_attempt_at=lease_until).order_by("id"))
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt after ``attempts`` failed ones."""
+    seconds = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _record_failure(row: EmailOutbox, exc: Exception) -> str:
+    attempts = row.attempts + 1
+    fields = {"attempts": attempts, "last_error": f"{type(exc).__name__}: {exc}"[:2000]}
+    if attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        logger.error("Giving up on email %s to %s after %d attempts: %s", row.pk, row.to, attempts, exc)
+        EmailOutbox.objects.filter(pk=row.pk).update(status=EmailOutbox.STATUS_DEAD, **fields)
+        return "dead"
+    logger.warning("Email %s failed (attempt %d), will retry: %s", row.pk, attempts, exc)
+    EmailOutbox.objects.filter(pk=row.pk).update(next_attempt_at=timezone.now() + retry_delay(attempts), **fields)
+    return "retried"
+
+
+def _close(connection) -> None:
+    with contextlib.suppress(Exception):
+        connection.close()
+
+
+def dispatch(limit: int = 0) -> Dict[str, int]:
+    """Send one batch of due emails. Returns counts of sent, retried and dead rows."""
+    counts = {"sent": 0, "retried": 0, "dead": 0}
+    rows = _claim(limit or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not rows:
+        return counts
+
+    connection = get_connection(fail_silently=False)
+    try:
+        for row in rows:
+            try:
+                connection.open()  # no-op while the connection is up
+                connection.send_messages([EmailMessage(row.subject, row.body, row.from_email, row.to)])
+            except Exception as exc:
+                # The SMTP session may be unusable now; the next row reconnects.
+                _close(connection)
+                counts[_record_failure(row, exc)] += 1
+                continue
+            EmailOutbox.objects.filter(pk=row.pk).update(
+                status=EmailOutbox.STATUS_SENT, attempts=row.attempts + 1, sent_at=timezone.now(), last_error=""
+            )
+            counts["sent"] += 1
+    finally:
+        _close(connection)
+    return counts
+
+
+def drain() -> Dict[str, int]:
+    """Dispatch batches until no due email is left."""
+    totals = {"sent": 0, "retried": 0, "dead": 0}
+    while True:
+        counts = dispatch()
+        for key, value in counts.items():
+            totals[key] += value
+        if sum(counts.values()) < settings.EMAIL_OUTBOX_BATCH_SIZE:
+            return totals
+
+
+def purge_sent(older_than: timedelta) -> int:
+    deleted, _ = EmailOutbox.objects.filter(
+        status=EmailOutbox.STATUS_SENT, sent_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+class Dispatcher:
+    """Background thread that drains the outbox when woken and every
+    EMAIL_OUTBOX_POLL_SECONDS, so scheduled retries go out too."""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def wake(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=settings.EMAIL_OUTBOX_POLL_SECONDS)
+            self._wake.clear()
+            try:
+                drain()
+            except Exception:  # pragma: no cover - background safeguard
+                logger.exception("Email outbox dispatch failed")
+            finally:
+                close_old_connections()
+
+
+dispatcher = Dispatcher()
@@ -0,0 +1,28 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination on ``-id``.
+
+    Each page costs one index range scan no matter how deep the cursor is, unlike OFFSET
+    pagination.
+    """
+
+    ordering = "-id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class OptInCursorPagination(IdCursorPagination):
+    """:class:`IdCursorPagination` that only kicks in when the client asks for it.
+
+    Requests without ``cursor`` or ``page_size`` keep getting the plain, unpaginated list,
+    so existing clients are unaffected.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
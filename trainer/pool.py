@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import queue
+import threading
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from . import llm, quota, sampling
+from .models import PooledSentence, SentencePoolBucket, Word
+
+logger = logging.getLogger(__name__)
+
+# Options that select a bucket; words_count is stored on the bucket but does not split it.
+BUCKET_FIELDS = ("source_language", "target_language", "level", "length", "topic", "sentence_type", "tense", "grammar_focus")
+
+# The generator accepts at most this many sentences per call.
+REFILL_CHUNK = 10
+
+
+def is_enabled() -> bool:
+    return settings.SENTENCE_POOL_ENABLED and llm.is_enabled()
+
+
+def bucket_key(spec: dict) -> str:
+    raw = "\x1f".join(str(spec.get(field) or "").strip().lower() for field in BUCKET_FIELDS)
+    if llm.backend_name() == "fake":
+        # Canned sentences from load tests must never be served by the real model's buckets.
+        raw = "fake\x1f" + raw
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def touch_bucket(user, spec: dict, words_count: int) -> SentencePoolBucket:
+    """Return the user's bucket for ``spec``, creating it and recording demand."""
+    key = bucket_key(spec)
+    now = timezone.now()
+    updated = SentencePoolBucket.objects.filter(user=user, key=key).update(
+        last_requested_at=now, words_count=words_count
+    )
+    if not updated:
+        fields = {field: str(spec.get(field) or "")[:200] for field in BUCKET_FIELDS}
+        try:
+            with transaction.atomic():
+                SentencePoolBucket.objects.create(
+                    user=user, key=key, words_count=words_count, last_requested_at=now, **fields
+                )
+        except IntegrityError:
+            pass  # created concurrently
+    return SentencePoolBucket.objects.get(user=user, key=key)
+
+
+def take(bucket: SentencePoolBucket, count: int) -> Optional[Tuple[List[str], List[Word]]]:
+    """Pop ``count`` sentences from the bucket, or return None if it does not hold that many.
+
+    Returns the sentences and the vocabulary they were generated from (words deleted since
+    generation are dropped).
+    """
+    with transaction.atomic():
+        rows = list(
+            PooledSentence.objects.select_for_update()
+            .filter(bucket=bucket)
+            .order_by("created_at", "id")[:count]
+        )
+        if len(rows) < count:
+            return None
+        PooledSentence.objects.filter(id__in=[row.id for row in rows]).delete()
+
+    word_ids = {word_id for row in rows for word_id in row.word_ids}
+    words = list(Word.objects.filter(user_id=bucket.user_id, id__in=word_ids)) if word_ids else []
+    return [row.sentence for row in rows], words
+
+
+def stock(bucket: SentencePoolBucket) -> int:
+    return PooledSentence.objects.filter(bucket=bucket).count()
+
+
+def needs_refill(bucket: SentencePoolBucket) -> bool:
+    return stock(bucket) < settings.SENTENCE_POOL_LOW_WATER
+
+
+def _sample_words(bucket: SentencePoolBucket) -> List[Word]:
+    return sampling.random_words(bucket.user_id, bucket.source_language, bucket.words_count)
+
+
+def refill(bucket: SentencePoolBucket) -> int:
+    """Generate sentences until the bucket holds SENTENCE_POOL_TARGET. Returns how many were added."""
+    from .views import DEFAULT_BASE_WORDS, generate_sentences_with_genai
+
+    try:
+        quota.check_budget(bucket.user_id)
+    except quota.Rejected:
+        return 0  # what is left of the token budget goes to live requests
+
+    missing = settings.SENTENCE_POOL_TARGET - stock(bucket)
+    added = 0
+    while missing > 0:
+        words = _sample_words(bucket)
+        if words:
+            user_words = [w.text for w in words]
+        elif bucket.source_language.lower() == "spanish":
+            user_words = DEFAULT_BASE_WORDS[: bucket.words_count]
+        else:
+            user_words = []
+
+        sentences = generate_sentences_with_genai(
+            user_words,
+            bucket.level,
+            bucket.length,
+            min(REFILL_CHUNK, max(5, missing)),
+            source_language=bucket.source_language,
+            target_language=bucket.target_language,
+            topic=bucket.topic,
+            sentence_type=bucket.sentence_type,
+            tense=bucket.tense,
+            grammar_focus=bucket.grammar_focus,
+            user_id=bucket.user_id,
+        )
+        sentences = [s for s in sentences if isinstance(s, str) and s.strip()]
+        if not sentences:
+            break
+        word_ids = [w.id for w in words]
+        PooledSentence.objects.bulk_create(
+            [PooledSentence(bucket=bucket, sentence=sentence, word_ids=word_ids) for sentence in sentences]
+        )
+        added += len(sentences)
+        missing -= len(sentences)
+
+    SentencePoolBucket.objects.filter(pk=bucket.pk).update(last_refilled_at=timezone.now())
+    return added
+
+
+def evict() -> Tuple[int, int]:
+    """Drop idle buckets, stale sentences and anything above each bucket's target size."""
+    now = timezone.now()
+    idle_cutoff = now - timedelta(days=settings.SENTENCE_POOL_BUCKET_IDLE_DAYS)
+    _, per_model = SentencePoolBucket.objects.filter(last_requested_at__lt=idle_cutoff).delete()
+    buckets_deleted = per_model.get(SentencePoolBucket._meta.label, 0)
+
+    age_cutoff = now - timedelta(hours=settings.SENTENCE_POOL_MAX_AGE_HOURS)
+    sentences_deleted, _ = PooledSentence.objects.filter(created_at__lt=age_cutoff).delete()
+
+    for bucket_id in SentencePoolBucket.objects.values_list("id", flat=True):
+        overflow_ids = list(
+            PooledSentence.objects.filter(bucket_id=bucket_id)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)[settings.SENTENCE_POOL_TARGET:]
+        )
+        if overflow_ids:
+            deleted, _ = PooledSentence.objects.filter(id__in=overflow_ids).delete()
+            sentences_deleted += deleted
+    return buckets_deleted, sentences_deleted
+
+
+class RefillScheduler:
+    """Single background thread that refills buckets queued from the request path.
+
+    A bucket already waiting in the queue is not queued twice.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[int]" = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def schedule(self, bucket_id: int) -> None:
+        with self._lock:
+            if bucket_id in self._pending:
+                return
+            self._pending.add(bucket_id)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sentence-pool-refill", daemon=True)
+                self._thread.start()
+        self._queue.put(bucket_id)
+
+    def _run(self) -> None:
+        while True:
+            bucket_id = self._queue.get()
+            try:
+                bucket = SentencePoolBucket.objects.filter(pk=bucket_id).first()
+                if bucket is not None and needs_refill(bucket):
+                    refill(bucket)
+            except Exception:  # pragma: no cover - background safeguard
+                logger.exception("Sentence pool refill failed for bucket %s", bucket_id)
+            finally:
+                with self._lock:
+                    self._pending.discard(bucket_id)
+                close_old_connections()
+                self._queue.task_done()
+
+
+scheduler = RefillScheduler()
+
+
+def refill_async(bucket: SentencePoolBucket) -> None:
+    """Queue a background refill if the bucket is under its low-water mark."""
+    if settings.SENTENCE_POOL_IN_PROCESS_REFILL and needs_refill(bucket):
+        scheduler.schedule(bucket.id)
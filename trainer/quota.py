@@ -0,0 +1,188 @@
+"""Rate limits and token budgets for the LLM endpoints.
+
+The views call :func:`admit` right before a request goes to the model, so answers from the
+verdict cache, the sentence pool or the offline shortcuts cost nothing. It checks:
+
+* the day's token budget of the user (``LLM_USER_DAILY_TOKENS``) and of everyone together
+  (``LLM_GLOBAL_DAILY_TOKENS``). The global one starts turning requests away at
+  ``LLM_SHED_AT`` of the budget, so the upstream quota is not run dry by the requests
+  already in flight;
+* a token bucket per user (``LLM_USER_RATE_PER_MINUTE``, bursts of ``LLM_USER_BURST``) and
+  one shared by everyone (``LLM_GLOBAL_RATE_PER_MINUTE`` / ``LLM_GLOBAL_BURST``).
+
+Limits hit by one user answer 429, global ones 503; both carry ``Retry-After``. Buckets
+live in this process (``LLM_RATE_LIMIT_BACKEND=local``) or in a Django cache shared by all
+workers (``cache``). :mod:`trainer.llm` reports the tokens each call spent to
+:func:`record_usage`.
+"""
+
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .cache import LRUCache
+from .models import LLMUsage
+
+logger = logging.getLogger(__name__)
+
+OVERLOADED = "AI is overloaded. Please try again later."
+
+
+class Rejected(Exception):
+    """Raised by :func:`admit`. ``status_code`` is 429 for the user's own limits, 503 for global ones."""
+
+    def __init__(self, detail: str, status_code: int, wait: float):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.wait = wait
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.wait))
+
+
+def _take(state: Optional[Tuple[float, float]], now: float, rate: float, capacity: float):
+    """Take one token from a bucket in ``state`` (tokens, as of). Returns (wait, new state);
+    wait is 0 when the token was available, else the seconds until it will be."""
+    tokens = capacity if state is None else min(capacity, state[0] + (now - state[1]) * rate)
+    if tokens >= 1:
+        return 0.0, (tokens - 1, now)
+    return (1 - tokens) / rate, (tokens, now)
+
+
+def _refill_seconds(state: Tuple[float, float], rate: float, capacity: float) -> float:
+    # Once a bucket is full again its state can be forgotten: a missing bucket is a full one.
+    return (capacity - state[0]) / rate
+
+
+class LocalBuckets:
+    """Token buckets in this process's memory. Each worker enforces the limits on its own."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self._states = LRUCache(max_keys, ttl_seconds=0)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        with self._lock:
+            wait, state = _take(self._states.get(key), time.time(), rate, capacity)
+            self._states.set(key, state, ttl_seconds=_refill_seconds(state, rate, capacity))
+        return wait
+
+    def clear(self) -> None:
+        self._states.clear()
+
+
+class CacheBuckets:
+    """Token buckets in a Django cache shared by all workers.
+
+    The read-modify-write is not atomic, so two requests arriving at the same moment may
+    both get the last token; the limits hold within a request or two.
+    """
+
+    def __init__(self, alias: str):
+        self.alias = alias
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        cache = caches[self.alias]
+        cache_key = f"llm-bucket:{key}"
+        wait, state = _take(cache.get(cache_key), time.time(), rate, capacity)
+        cache.set(cache_key, state, timeout=max(1, math.ceil(_refill_seconds(state, rate, capacity))))
+        return wait
+
+    def clear(self) -> None:
+        caches[self.alias].clear()
+
+
+def _build_buckets():
+    if settings.LLM_RATE_LIMIT_BACKEND.strip().lower() == "cache":
+        return CacheBuckets(settings.LLM_RATE_LIMIT_CACHE)
+    return LocalBuckets()
+
+
+buckets = _build_buckets()
+
+
+def _seconds_until_tomorrow() -> float:
+    now = timezone.localtime()
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo)
+    return (tomorrow - now).total_seconds()
+
+
+def tokens_used_today(user_id: int) -> Tuple[int, int]:
+    """(tokens used by the user, tokens used by everyone) so far today."""
+    rows = dict(
+        LLMUsage.objects.filter(Q(user_id=user_id) | Q(user__isnull=True), date=timezone.localdate()).values_list(
+            "user_id", "total_tokens"
+        )
+    )
+    return rows.get(user_id, 0), rows.get(None, 0)
+
+
+def check_budget(user_id: int) -> None:
+    """Raise :class:`Rejected` if today's token budget of the user or of everyone is spent."""
+    user_budget = settings.LLM_USER_DAILY_TOKENS
+    global_budget = settings.LLM_GLOBAL_DAILY_TOKENS
+    if not user_budget and not global_budget:
+        return
+    user_tokens, all_tokens = tokens_used_today(user_id)
+    if user_budget and user_tokens >= user_budget:
+        raise Rejected("Daily AI usage limit reached. Please try again tomorrow.", 429, _seconds_until_tomorrow())
+    if global_budget and all_tokens >= global_budget * settings.LLM_SHED_AT:
+        logger.warning("LLM token budget nearly spent (%d of %d); shedding requests", all_tokens, global_budget)
+        raise Rejected(OVERLOADED, 503, _seconds_until_tomorrow())
+
+
+def _take_token(key: str, per_minute: float, burst: int) -> float:
+    if per_minute <= 0:
+        return 0.0
+    return buckets.take(key, per_minute / 60, max(1, burst))
+
+
+def admit(user_id: int) -> None:
+    """Let one LLM request of ``user_id`` through, or raise :class:`Rejected`."""
+    check_budget(user_id)
+    wait = _take_token(f"user:{user_id}", settings.LLM_USER_RATE_PER_MINUTE, settings.LLM_USER_BURST)
+    if wait:
+        raise Rejected("Too many AI requests. Please slow down.", 429, wait)
+    wait = _take_token("global", settings.LLM_GLOBAL_RATE_PER_MINUTE, settings.LLM_GLOBAL_BURST)
+    if wait:
+        raise Rejected(OVERLOADED, 503, wait)
+
+
+def _add_usage(user_id: Optional[int], today, deltas: dict) -> None:
+    """Add ``deltas`` to the usage row of ``user_id`` (None: the totals row), creating it if needed."""
+    lookup = {"user_id": user_id, "date": today} if user_id is not None else {"user__isnull": True, "date": today}
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if LLMUsage.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            LLMUsage.objects.create(user_id=user_id, date=today, **deltas)
+    except IntegrityError:  # created concurrently
+        LLMUsage.objects.filter(**lookup).update(**updates)
+
+
+def record_usage(user_id: Optional[int], usage) -> None:
+    """Add one call's ``response.usage`` to today's row of the user and to the totals row."""
+    deltas = {
+        "requests": 1,
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+    }
+    today = timezone.localdate()
+    try:
+        if user_id is not None:
+            _add_usage(user_id, today, deltas)
+        _add_usage(None, today, deltas)
+    except DatabaseError:
+        logger.warning("Recording LLM usage failed", exc_info=True)
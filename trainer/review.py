@@ -0,0 +1,73 @@
+"""Spaced-repetition scheduling of vocabulary (SM-2).
+
+Every checked translation is a review of the words it was built around: a correct
+answer pushes their next due date out by a growing interval, a wrong one brings them back
+tomorrow. Generation then asks for the words that are due first.
+"""
+
+from datetime import timedelta
+from typing import Iterable, List, Sequence, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Word, WordReviewState
+
+# SM-2 answer quality (0-5) given to a word in a correct / wrong translation.
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+MIN_EASE = 1.3
+
+
+def schedule(state: WordReviewState, quality: int, now) -> None:
+    """Apply one SM-2 review of ``quality`` to ``state`` in place."""
+    if quality >= 3:
+        if state.repetitions == 0:
+            state.interval_days = 1
+        elif state.repetitions == 1:
+            state.interval_days = 6
+        else:
+            state.interval_days = round(state.interval_days * state.ease)
+        state.repetitions += 1
+    else:
+        state.repetitions = 0
+        state.interval_days = 1
+        state.lapses += 1
+    state.ease = max(MIN_EASE, state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    state.due_at = now + timedelta(days=state.interval_days)
+    state.last_reviewed_at = now
+
+
+def record_reviews(user_id: int, outcomes: Iterable[Tuple[Sequence[int], bool]]) -> None:
+    """Reschedule words after checks; ``outcomes`` holds (word ids, answer was correct) pairs."""
+    outcomes = [(list(word_ids), correct) for word_ids, correct in outcomes if word_ids]
+    if not outcomes:
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        word_ids = {word_id for ids, _ in outcomes for word_id in ids}
+        states = WordReviewState.objects.select_for_update().filter(user_id=user_id, word_id__in=word_ids)
+        states = {state.word_id: state for state in states}
+        for ids, correct in outcomes:
+            for word_id in ids:
+                if word_id in states:
+                    schedule(states[word_id], QUALITY_CORRECT if correct else QUALITY_WRONG, now)
+        WordReviewState.objects.bulk_update(
+            list(states.values()),
+            ["ease", "interval_days", "repetitions", "lapses", "due_at", "last_reviewed_at"],
+        )
+
+
+def due_words(user_id: int, language: str, count: int, exclude_ids: Iterable[int] = ()) -> List[Word]:
+    """Up to ``count`` of the user's words in ``language``, most overdue first.
+
+    Words in ``exclude_ids`` are only used when there are not enough others. Each query
+    reads at most ``count`` entries of the (user, language, due_at) index.
+    """
+    exclude_ids = set(exclude_ids)
+    states = WordReviewState.objects.filter(user_id=user_id, language=language).order_by("due_at")
+    word_ids = list(states.exclude(word_id__in=exclude_ids).values_list("word_id", flat=True)[:count])
+    if len(word_ids) < count and exclude_ids:
+        word_ids += states.filter(word_id__in=exclude_ids).values_list("word_id", flat=True)[: count - len(word_ids)]
+    words = Word.objects.in_bulk(word_ids)
+    return [words[word_id] for word_id in word_ids if word_id in words]
@@ -0,0 +1,52 @@
+"""Random word sampling that costs O(k) index lookups instead of reading the whole dictionary."""
+
+import random
+from typing import Iterable, List
+
+from .models import Word
+
+# Probes that may land on an excluded or already chosen word before skipping past them.
+_PROBES = 3
+
+
+def _first(ids):
+    return next(iter(ids[:1]), None)
+
+
+def random_words(user_id: int, language: str, count: int, exclude_ids: Iterable[int] = ()) -> List[Word]:
+    """Up to ``count`` random words of the user in ``language``.
+
+    Words in ``exclude_ids`` are only used when there are not enough others. Large
+    dictionaries are sampled by probing random points of the id range on the
+    (user, language, id) index: each probe takes the first id at or after the point, so a
+    word that follows a gap left by deletions is somewhat more likely to be picked.
+    """
+    exclude_ids = set(exclude_ids)
+    words = Word.objects.filter(user_id=user_id, language=language)
+    ids = words.order_by("id").values_list("id", flat=True)
+
+    head = list(ids[: count + len(exclude_ids) + 1])
+    if len(head) <= count + len(exclude_ids):
+        # Small dictionary: that was all of it.
+        fresh = [word_id for word_id in head if word_id not in exclude_ids]
+        recent = [word_id for word_id in head if word_id in exclude_ids]
+        random.shuffle(fresh)
+        random.shuffle(recent)
+        chosen = (fresh + recent)[:count]
+    else:
+        # At least ``count`` ids are not excluded, so the fallback probe always finds one.
+        low, high = head[0], ids.reverse()[0]
+        chosen = []
+        for _ in range(count):
+            taken = exclude_ids.union(chosen)
+            for _ in range(_PROBES):
+                word_id = _first(ids.filter(id__gte=random.randint(low, high)))
+                if word_id not in taken:
+                    break
+            else:
+                free = ids.exclude(id__in=taken)
+                word_id = _first(free.filter(id__gte=random.randint(low, high))) or _first(free)
+            chosen.append(word_id)
+
+    by_id = Word.objects.in_bulk(chosen)
+    return [by_id[word_id] for word_id in chosen if word_id in by_id]
@@ -23,29 +23,28 @@ class UserSerializer(serializers.ModelSerializer):
 
 
 class WordSerializer(serializers.ModelSerializer):
+    # Duplicates are rejected by the unique_word_per_user_ci constraint on insert/update;
+    # WordViewSet turns the IntegrityError into this validation error.
+    DUPLICATE_MESSAGE = "This word already exists in your dictionary for this language."
+
     class Meta:
         model = Word
         fields = ["id", "text", "language"]
         read_only_fields = ["user"]
+        # The model's functional unique constraint is enforced by the database, not by a
+        # pre-query here.
+        validators = []
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sparse fieldsets (``?fields=id,text``): drop everything not asked for.
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def validate(self, data):
-        request = self.context.get("request")
-        user = getattr(request, "user", None)
-        text = data.get("text", "").strip()
-        
-        # If language is not provided in data, it might use the default from the model 
-        # but here we are validating input data.
-        # We can fetch the language from data or fall back to "Spanish" effectively for the check
-        language = data.get("language", "Spanish")
-
-        if user and user.is_authenticated:
-            qs = Word.objects.filter(user=user, text__iexact=text, language__iexact=language)
-            if self.instance:
-                qs = qs.exclude(pk=self.instance.pk)
-            if qs.exists():
-                raise serializers.ValidationError("This word already exists in your dictionary for this language.")
-        
-        data['text'] = text
+        if "text" in data:
+            data["text"] = data["text"].strip()
         return data
 
 
@@ -65,6 +64,14 @@ class ExerciseSerializer(serializers.ModelSerializer):
         ]
 
 
+class SessionSummarySerializer(serializers.ModelSerializer):
+    """A session without its exercises, which are paged via ``sessions/<id>/exercises/``."""
+
+    class Meta:
+        model = Session
+        fields = ["id", "date", "last_words_used"]
+
+
 class SessionSerializer(serializers.ModelSerializer):
     exercises = ExerciseSerializer(many=True, read_only=True)
 
@@ -1,7 +1,10 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
 
+from .authentication import token_cache
 from .models import Profile
 
 User = get_user_model()
@@ -11,3 +14,21 @@ User = get_user_model()
 def ensure_profile(sender, instance: User, created: bool, **kwargs):  # pragma: no cover - simple hook
     if created:
         Profile.objects.get_or_create(user=instance)
+
+
+# Cached tokens carry a snapshot of the user and profile; drop it once a change is committed.
+@receiver(post_save, sender=User)
+def forget_cached_user(sender, instance: User, created: bool, **kwargs):
+    if not created:
+        transaction.on_commit(lambda: token_cache.forget_user(instance.pk))
+
+
+@receiver(post_save, sender=Profile)
+def forget_cached_profile(sender, instance: Profile, created: bool, **kwargs):
+    if not created:
+        transaction.on_commit(lambda: token_cache.forget_user(instance.user_id))
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance: Token, **kwargs):
+    transaction.on_commit(lambda: token_cache.forget([instance.key]))
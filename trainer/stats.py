@@ -0,0 +1,145 @@
+"""Incremental maintenance of :class:`~trainer.models.UserStats` and the per-day
+:class:`~trainer.models.DailyActivity` log.
+
+Each write path reports its change here inside its own transaction. A user without a
+stats row yet gets one built from scratch (which already includes the change), so the
+counters never need a separate backfill to be correct.
+"""
+
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .models import ArchivedSession, DailyActivity, Exercise, Session, UserStats, Word
+
+
+# Gaps and islands: on consecutive days day_number - ROW_NUMBER() is constant, so grouping
+# by it yields one row per streak.
+_STREAKS_SQL = """
+WITH runs AS (
+    SELECT COUNT(*) AS length, MAX(day_number) AS last_day
+    FROM (
+        SELECT day_number, day_number - ROW_NUMBER() OVER (ORDER BY day_number) AS island
+        FROM {table}
+        WHERE user_id = %s AND exercises > 0
+    ) days
+    GROUP BY island
+)
+SELECT
+    COALESCE(SUM(length), 0),
+    COALESCE(MAX(length), 0),
+    MAX(last_day),
+    (SELECT length FROM runs ORDER BY last_day DESC LIMIT 1)
+FROM runs
+"""
+
+
+def streaks(user_id: int) -> Tuple[int, int, int, Optional[date]]:
+    """(days practised, run ending at the last practice day, longest run, last practice day)."""
+    with connection.cursor() as cursor:
+        cursor.execute(_STREAKS_SQL.format(table=DailyActivity._meta.db_table), [user_id])
+        days, longest, last_day, current_run = cursor.fetchone()
+    return days, current_run or 0, longest, date.fromordinal(last_day) if last_day else None
+
+
+def _record_day(user_id: int, **deltas) -> None:
+    """Add ``deltas`` to today's DailyActivity row, creating it if needed."""
+    today = timezone.localdate()
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if DailyActivity.objects.filter(user_id=user_id, date=today).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            DailyActivity.objects.create(user_id=user_id, date=today, day_number=today.toordinal(), **deltas)
+    except IntegrityError:  # created concurrently
+        DailyActivity.objects.filter(user_id=user_id, date=today).update(**updates)
+
+
+def rebuild(user_id: int) -> UserStats:
+    """Recompute the user's stats row from the underlying tables."""
+    exercises = Exercise.objects.filter(user_id=user_id)
+    archived = ArchivedSession.objects.filter(user_id=user_id).aggregate(
+        sessions=Count("id"),
+        exercises=Sum("exercises_total"),
+        attempts=Sum("attempts_total"),
+        correct=Sum("correct_total"),
+    )
+    attempted = exercises.exclude(user_translation="")
+    days, current_run, longest, last_day = streaks(user_id)
+
+    stats, _ = UserStats.objects.update_or_create(
+        user_id=user_id,
+        defaults={
+            "words_total": Word.objects.filter(user_id=user_id).count(),
+            "exercises_total": exercises.count() + (archived["exercises"] or 0),
+            "attempts_total": attempted.count() + (archived["attempts"] or 0),
+            "correct_total": attempted.filter(is_correct=True).count() + (archived["correct"] or 0),
+            "sessions_total": Session.objects.filter(user_id=user_id).count() + archived["sessions"],
+            "days_practiced": days,
+            "current_run": current_run,
+            "longest_streak": longest,
+            "last_practice_date": last_day,
+        },
+    )
+    return stats
+
+
+def get(user_id: int) -> UserStats:
+    return UserStats.objects.filter(user_id=user_id).first() or rebuild(user_id)
+
+
+def current_streak(stats: UserStats, today: Optional[date] = None) -> int:
+    """Consecutive practice days ending today (0 if the user has not practised today)."""
+    today = today or timezone.localdate()
+    return stats.current_run if stats.last_practice_date == today else 0
+
+
+def record_session(user_id: int) -> None:
+    if not UserStats.objects.filter(user_id=user_id).update(sessions_total=F("sessions_total") + 1):
+        rebuild(user_id)
+
+
+def record_exercises(user_id: int, count: int) -> None:
+    """New exercises were generated now, which also makes today a practice day."""
+    today = timezone.localdate()
+    with transaction.atomic():
+        _record_day(user_id, exercises=count)
+        stats = UserStats.objects.select_for_update().filter(user_id=user_id).first()
+        if stats is None:
+            stats = rebuild(user_id)  # already counts the new exercises
+            count = 0
+        stats.exercises_total += count
+        last = stats.last_practice_date
+        if last is None or today > last:
+            stats.current_run = stats.current_run + 1 if last == today - timedelta(days=1) else 1
+            stats.longest_streak = max(stats.longest_streak, stats.current_run)
+            stats.days_practiced += 1
+            stats.last_practice_date = today
+        elif today < last:
+            # The clock or the time zone moved backwards; recount rather than guess.
+            rebuild(user_id)
+            return
+        stats.save()
+
+
+def record_attempts(user_id: int, attempts: int, correct: int) -> None:
+    """Apply changes in the number of attempted and correct exercises."""
+    if not attempts and not correct:
+        return
+    with transaction.atomic():
+        _record_day(user_id, attempts=attempts, correct=correct)
+        updated = UserStats.objects.filter(user_id=user_id).update(
+            attempts_total=F("attempts_total") + attempts,
+            correct_total=F("correct_total") + correct,
+        )
+        if not updated:
+            rebuild(user_id)
+
+
+def attempt_state(exercise: Exercise):
+    """(attempted, correct) as counted by the stats, for diffing before/after a check."""
+    attempted = exercise.user_translation != ""
+    return int(attempted), int(attempted and exercise.is_correct)
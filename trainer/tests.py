@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from . import importer
+from .models import Exercise, Session, Word
+from .views import _save_exercises
+
+User = get_user_model()
+
+
+class SaveExercisesQueryCountTests(TestCase):
+    """Saving a generation takes the same number of statements however many sentences and
+    words it has (up to SQLite's bulk-insert batch size)."""
+
+    # savepoint, INSERT exercises, INSERT word links, INSERT session links,
+    # stats savepoint, UPDATE DailyActivity, SELECT UserStats FOR UPDATE, UPDATE UserStats,
+    # release, release, prefetch of words_used
+    QUERIES = 11
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="learner", email="learner@example.com", password="pw")
+        Word.objects.bulk_create([Word(user=cls.user, text=f"palabra{n}", language="Spanish") for n in range(20)])
+        cls.words = list(Word.objects.filter(user=cls.user).order_by("id"))
+        cls.session = Session.objects.create(user=cls.user)
+
+    def _save(self, sentences, words):
+        return _save_exercises(self.user, self.session, sentences, words, [w.text for w in words])
+
+    def test_query_count_does_not_grow_with_sentences_and_words(self):
+        # The first generation of the day also creates the stats and DailyActivity rows.
+        self._save(["Frase inicial."], self.words[:1])
+
+        for sentences, words in ((1, 1), (10, 20)):
+            with self.subTest(sentences=sentences, words=words):
+                with self.assertNumQueries(self.QUERIES):
+                    _, exercises = self._save([f"Frase {n}." for n in range(sentences)], self.words[:words])
+                self.assertEqual(len(exercises), sentences)
+                self.assertTrue(all(len(e.words_used.all()) == words for e in exercises))
+
+        self.assertEqual(self.session.exercises.count(), 1 + 1 + 10)
+        self.assertEqual(Exercise.objects.filter(user=self.user).count(), 12)
+
+
+class ImportWordsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="importer", email="importer@example.com", password="pw")
+        Word.objects.create(user=cls.user, text="perro")
+
+    def test_counts_only_the_rows_the_insert_wrote(self):
+        def rows():
+            yield "Perro", None
+            yield "gato", None
+            # Another import adds the same word before this one's chunk is flushed.
+            Word.objects.create(user=self.user, text="GATO")
+            yield "casa", None
+
+        report = importer.import_words(self.user, rows(), "Spanish")
+
+        self.assertEqual((report["created"], report["duplicate"]), (1, 2))
+        self.assertEqual([r["status"] for r in report["results"]], ["duplicate", "duplicate", "created"])
+        self.assertEqual(Word.objects.filter(user=self.user).count(), 3)
+
+    def test_duplicates_follow_the_database_lower(self):
+        report = importer.import_words(self.user, [("ñandú", None), ("Ñandú", None)], "Spanish")
+
+        # SQLite's LOWER() leaves non-ASCII letters alone, so it accepts both.
+        expected = 2 if connection.vendor == "sqlite" else 1
+        self.assertEqual(report["created"], expected)
+        self.assertEqual(Word.objects.filter(user=self.user, text__endswith="andú").count(), expected)
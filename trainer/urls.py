@@ -1,7 +1,10 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (
+    ActivityView,
+    BatchCheckTranslationView,
     ChatView,
     CheckTranslationView,
     ChangePasswordView,
@@ -13,7 +16,9 @@ from .views import (
     PasswordResetRequestView,
     ProgressView,
     RegisterView,
+    SessionExercisesView,
     Toggle2FAView,
+    TranslationCacheStatsView,
     Verify2FAView,
     VerifyRegistrationView,
     WordViewSet,
@@ -26,8 +31,15 @@ urlpatterns = [
     path("", include(router.urls)),
     path("generate/", GenerateView.as_view(), name="generate"),
     path("check/", CheckTranslationView.as_view(), name="check"),
+    path("check/batch/", BatchCheckTranslationView.as_view(), name="check-batch"),
+    path("check/cache-stats/", TranslationCacheStatsView.as_view(), name="check-cache-stats"),
     path("chat/", ChatView.as_view(), name="chat"),
+    path("async/generate/", async_views.generate, name="async-generate"),
+    path("async/check/", async_views.check_translation, name="async-check"),
+    path("async/chat/", async_views.chat, name="async-chat"),
+    path("sessions/<int:pk>/exercises/", SessionExercisesView.as_view(), name="session-exercises"),
     path("progress/", ProgressView.as_view(), name="progress"),
+    path("progress/activity/", ActivityView.as_view(), name="progress-activity"),
     path("auth/register/", RegisterView.as_view(), name="register"),
     path("auth/verify-registration/", VerifyRegistrationView.as_view(), name="verify-registration"),
     path("auth/login/", LoginView.as_view(), name="login"),
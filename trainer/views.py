@@ -1,3 +1,5 @@
+import csv
+import hashlib
 import json
 import logging
 import os
@@ -5,25 +7,44 @@ import random
 import re
 import unicodedata
 import uuid
-from datetime import timedelta
+from datetime import date, timedelta
 from typing import List, Tuple
 
 from django.contrib.auth import authenticate, get_user_model, login, logout
-from django.core.mail import send_mail
-from django.db import transaction
-from django.db.models import Q
+from django.db import IntegrityError, transaction
+from django.db.models import Q, prefetch_related_objects
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from openai import OpenAI
-from rest_framework import permissions, status, viewsets
+from django.utils.http import parse_etags
+from rest_framework import generics, permissions, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
 from config import settings
-from .models import Exercise, Profile, Session, VerificationCode, Word
+from . import importer, llm, outbox, quota, review, sampling, stats
+from . import pool as sentence_pool
+from .cache import translation_cache
+from .matching import get_matcher, normalize_for_match
+from .models import (
+    DailyActivity,
+    Exercise,
+    Profile,
+    Session,
+    VerificationCode,
+    Word,
+    WordTombstone,
+    sentence_digest,
+)
+from .pagination import IdCursorPagination, OptInCursorPagination
 from .serializers import (
-    SessionSerializer,
+    ExerciseSerializer,
+    SessionSummarySerializer,
     UserSerializer,
     WordSerializer,
 )
@@ -66,105 +87,57 @@ def _send_code_email(user: User, code: str, purpose: str) -> None:
         body = f"Код для сброса пароля: {code}. Срок действия 10 минут."
     else:
         body = f"Код для входа (2FA): {code}. Срок действия 10 минут."
-    send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+    outbox.enqueue(subject, body, [user.email])
+
+
+def _session_expired(session: Session) -> bool:
+    """Whether ``session`` is over under the SESSION_ROLLOVER policy."""
+    if settings.SESSION_ROLLOVER == "daily":
+        return timezone.localtime(session.date).date() != timezone.localdate()
+    if settings.SESSION_ROLLOVER == "idle":
+        return timezone.now() - session.date > timedelta(minutes=settings.SESSION_IDLE_MINUTES)
+    return False
 
 
 def _ensure_session(user: User) -> Session:
     session = Session.objects.filter(user=user).order_by("-date").first()
     if session is None:
         session = Session.objects.create(user=user, last_words_used=[])
+        stats.record_session(user.id)
+    elif _session_expired(session):
+        # Carry the recent words over so the next session does not repeat them straight away.
+        session = Session.objects.create(user=user, last_words_used=session.last_words_used)
+        stats.record_session(user.id)
     return session
 
 
-def _find_words_in_sentence(sentence: str, word_list: List[str]) -> List[str]:
+def _find_words_in_sentence(sentence: str, word_list: List[str], normalized: List[str] = None) -> List[str]:
     """Find which vocabulary items appear in the sentence.
 
     Uses normalized matching (case/accents/punctuation) and avoids substring false-positives.
-    Supports both single-word items and multi-word phrases.
+    Supports both single-word items and multi-word phrases. ``normalized`` optionally holds
+    the stored normalized form of each item.
     """
+    return get_matcher(tuple(word_list), tuple(normalized) if normalized is not None else None).find(sentence)
 
-    def normalize_for_match(text: str) -> str:
-        # Remove accents
-        text = unicodedata.normalize("NFD", text)
-        text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
-        # Lowercase and replace punctuation with spaces
-        text = text.lower()
-        text = "".join(ch if ch.isalnum() else " " for ch in text)
-        # Collapse whitespace
-        return " ".join(text.split())
-
-    normalized_sentence = normalize_for_match(sentence)
-    if not normalized_sentence:
-        return []
-
-    sentence_tokens = set(normalized_sentence.split())
-
-    found_words: List[str] = []
-    for raw_word in word_list:
-        normalized_word = normalize_for_match(raw_word)
-        if not normalized_word:
-            continue
-
-        if " " not in normalized_word:
-            if normalized_word in sentence_tokens:
-                found_words.append(raw_word)
-            continue
-
-        # Phrase match: require boundaries so we don't match across tokens accidentally.
-        pattern = rf"(?<!\\w){re.escape(normalized_word)}(?!\\w)"
-        if re.search(pattern, normalized_sentence):
-            found_words.append(raw_word)
-
-    return found_words
-
-
-def _compute_streak(dates_desc: List[timezone.datetime.date], *, today) -> int:
-    date_set = set(dates_desc)
-    streak = 0
-    cursor = today
-    while cursor in date_set:
-        streak += 1
-        cursor -= timedelta(days=1)
-    return streak
 
-
-def _compute_longest_streak(dates_asc: List[timezone.datetime.date]) -> int:
-    if not dates_asc:
-        return 0
-    best = 1
-    current = 1
-    for prev, cur in zip(dates_asc, dates_asc[1:]):
-        if cur == prev + timedelta(days=1):
-            current += 1
-        else:
-            best = max(best, current)
-            current = 1
-    return max(best, current)
+def _stored_normalized_forms(selected_words: List[Word], user_words: List[str]):
+    """``Word.normalized_text`` for ``user_words`` when they are exactly the selected words."""
+    if len(selected_words) != len(user_words) or any(w.text != t for w, t in zip(selected_words, user_words)):
+        return None
+    if not all(w.normalized_text for w in selected_words):
+        return None
+    return [w.normalized_text for w in selected_words]
 
 
 def _select_words(user: User, session: Session, target_count: int, language: str = "Spanish") -> Tuple[List[Word], Session]:
-    words = list(Word.objects.filter(user=user, language=language))
-    if not words:
+    """Words for the next generation, skipping the last generation's words when possible."""
+    recent_ids = (session.last_words_used or [])[-5:]
+    pick = sampling.random_words if settings.WORD_SELECTION == "random" else review.due_words
+    selected = pick(user.id, language, max(1, target_count), exclude_ids=recent_ids)
+    if not selected:
         return [], session
 
-    target_count = max(1, min(target_count, len(words)))
-
-    recent_ids = set((session.last_words_used or [])[-5:])
-    shuffled = words[:]
-    random.shuffle(shuffled)
-
-    selected: List[Word] = []
-    for w in shuffled:
-        if len(selected) >= target_count:
-            break
-        if w.id in recent_ids and len(shuffled) > target_count:
-            continue
-        selected.append(w)
-
-    if len(selected) < target_count:
-        remaining = [w for w in shuffled if w not in selected]
-        selected.extend(remaining[: target_count - len(selected)])
-
     session.last_words_used = [w.id for w in selected][-10:]
     session.save(update_fields=["last_words_used"])
     return selected, session
@@ -198,10 +171,10 @@ def _normalize_text(text: str) -> str:
     return text.lower().strip()
 
 
-def generate_sentences_with_genai(
-    user_words: List[str], 
-    level: str, 
-    length: str, 
+def _generation_messages(
+    user_words: List[str],
+    level: str,
+    length: str,
     num_sentences: int,
     source_language: str,
     target_language: str,
@@ -209,12 +182,7 @@ def generate_sentences_with_genai(
     sentence_type: str = "mixed",
     tense: str = "mixed",
     grammar_focus: str = "",
-) -> List[str]:
-    api_key = settings.OPENAI_API_KEY
-    
-    if not api_key:
-        return [f"Example sentence with {word}" for word in user_words[:num_sentences]]
-    
+) -> List[dict]:
     source_lang = source_language
     target_lang = target_language
     
@@ -285,71 +253,274 @@ def generate_sentences_with_genai(
         'Return ONLY JSON format: {"sentences": ["...", "..."]}.'
     )
     
-    client = OpenAI(api_key=api_key)
     system_message = (
         f"You are a native {source_lang} speaker teaching the language. "
         f"Generate ONLY sentences that native speakers actually use in daily life. "
         f"Reject anything that sounds unnatural, forced, or textbook-like. "
         f"Think: Would my friend/family actually say this? If no, don't use it."
     )
-    response = client.chat.completions.create(
-        model=settings.OPENAI_MODEL_NAME,
-        messages=[
-            {"role": "system", "content": system_message},
-            {"role": "user", "content": prompt},
-        ],
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _parse_generated_sentences(raw_text: str, num_sentences: int) -> List[str]:
+    raw_text = _strip_code_fences(raw_text)
+    payload = _parse_json_payload(raw_text)
+    sentences = payload.get("sentences")
+    if isinstance(sentences, list) and sentences:
+        return sentences[:num_sentences]
+
+    # Fallback if model did not return expected structure
+    return [part.strip() for part in raw_text.split("\n") if part.strip()][:num_sentences]
+
+
+def generate_sentences_with_genai(
+    user_words: List[str], 
+    level: str, 
+    length: str, 
+    num_sentences: int,
+    source_language: str,
+    target_language: str,
+    topic: str = "any",
+    sentence_type: str = "mixed",
+    tense: str = "mixed",
+    grammar_focus: str = "",
+    user_id: int = None,
+) -> List[str]:
+    if not llm.is_enabled():
+        return [f"Example sentence with {word}" for word in user_words[:num_sentences]]
+
+    messages = _generation_messages(
+        user_words,
+        level,
+        length,
+        num_sentences,
+        source_language,
+        target_language,
+        topic=topic,
+        sentence_type=sentence_type,
+        tense=tense,
+        grammar_focus=grammar_focus,
+    )
+    response = llm.chat_completion(
+        purpose=llm.PURPOSE_GENERATE, messages=messages, max_tokens=500, temperature=0.7, user_id=user_id
+    )
+    return _parse_generated_sentences(response.choices[0].message.content, num_sentences)
+
+
+class SentenceStreamParser:
+    """Incrementally pull strings out of a streamed ``{"sentences": [...]}`` payload.
+
+    ``feed`` takes the next chunk of model output and returns every sentence whose
+    closing quote has arrived since the previous call.
+    """
+
+    _ARRAY_START = re.compile(r'"sentences"\s*:\s*\[')
+
+    def __init__(self):
+        self.text = ""
+        self._pos = None  # index just after the last consumed array element
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[str]:
+        self.text += chunk
+        if self.finished:
+            return []
+        if self._pos is None:
+            match = self._ARRAY_START.search(self.text)
+            if not match:
+                return []
+            self._pos = match.end()
+
+        found: List[str] = []
+        while self._pos < len(self.text):
+            ch = self.text[self._pos]
+            if ch.isspace() or ch == ",":
+                self._pos += 1
+            elif ch == "]":
+                self.finished = True
+                break
+            elif ch == '"':
+                end = self._string_end(self._pos)
+                if end is None:
+                    break  # wait for the rest of this string
+                try:
+                    value = json.loads(self.text[self._pos:end])
+                except json.JSONDecodeError:
+                    value = None
+                if isinstance(value, str) and value.strip():
+                    found.append(value.strip())
+                self._pos = end
+            else:
+                # Not a list of strings after all; leave it to the full-text fallback.
+                self.finished = True
+                break
+        return found
+
+    def _string_end(self, start: int):
+        idx = start + 1
+        while idx < len(self.text):
+            ch = self.text[idx]
+            if ch == "\\":
+                idx += 2
+                continue
+            if ch == '"':
+                return idx + 1
+            idx += 1
+        return None
+
+
+def stream_sentences_with_genai(
+    user_words: List[str],
+    level: str,
+    length: str,
+    num_sentences: int,
+    source_language: str,
+    target_language: str,
+    topic: str = "any",
+    sentence_type: str = "mixed",
+    tense: str = "mixed",
+    grammar_focus: str = "",
+    user_id: int = None,
+):
+    """Streaming variant of ``generate_sentences_with_genai`` that yields sentences as they complete."""
+    if not llm.is_enabled():
+        yield from generate_sentences_with_genai(user_words, level, length, num_sentences, source_language, target_language)
+        return
+
+    messages = _generation_messages(
+        user_words,
+        level,
+        length,
+        num_sentences,
+        source_language,
+        target_language,
+        topic=topic,
+        sentence_type=sentence_type,
+        tense=tense,
+        grammar_focus=grammar_focus,
+    )
+    stream = llm.chat_completion(
+        purpose=llm.PURPOSE_GENERATE,
+        messages=messages,
         max_tokens=500,
         temperature=0.7,
+        stream=True,
+        user_id=user_id,
     )
-    raw_text = response.choices[0].message.content.strip()
-    
-    # Strip markdown code fences if present
+
+    parser = SentenceStreamParser()
+    emitted = 0
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        for sentence in parser.feed(delta):
+            yield sentence
+            emitted += 1
+            if emitted >= num_sentences:
+                stream.close()
+                return
+
+    if emitted == 0:
+        # Model did not stream the expected structure; parse whatever it sent.
+        yield from _parse_generated_sentences(parser.text, num_sentences)
+
+
+GRADING_RULES = (
+    "Grade primarily by MEANING, not by perfect spelling/grammar.\n"
+    "\n"
+    "✅ Treat as CORRECT (is_correct=true) when the meaning is clearly the same, even if there are minor issues like:\n"
+    "- Typos / misspellings that are still understandable (e.g., 'bcause' vs 'because')\n"
+    "- Capitalization differences ('i' vs 'I')\n"
+    "- Punctuation differences\n"
+    "- Missing accent marks in Spanish (á é í ó ú ñ ü)\n"
+    "- Minor article/preposition differences that do not change meaning\n"
+    "- Minor word order differences that still sound natural/understandable\n"
+    "\n"
+    "🚫 Mark as INCORRECT (is_correct=false) only when there is a MEANING error, such as:\n"
+    "- Wrong subject/object (changes who did what to whom), when it is unambiguous\n"
+    "- Wrong tense/time that changes meaning (past vs future)\n"
+    "- Negation mistakes (adding/removing 'not', 'no', 'nunca', etc.)\n"
+    "- Missing or extra key information that changes meaning\n"
+    "- Wrong key vocabulary (dog vs cat, buy vs sell, etc.)\n"
+    "\n"
+    "IMPORTANT:\n"
+    "- Do NOT invent errors. Only mention a problem if it is definitely present.\n"
+    "- If the source sentence allows more than one plausible interpretation (e.g., implicit/ambiguous subject), be lenient and accept the user's translation if it matches one plausible meaning.\n"
+    "- If is_correct=true, set explanation to an empty string.\n"
+)
+
+MAX_BATCH_CHECK_ITEMS = 20
+
+
+def _language_pair(language_direction: str) -> Tuple[str, str]:
+    if language_direction == "en-to-es":
+        return "English", "Spanish"
+    return "Spanish", "English"  # es-to-en (default)
+
+
+def _strip_code_fences(raw_text: str) -> str:
+    raw_text = raw_text.strip()
     if raw_text.startswith("```json"):
         raw_text = raw_text[7:]
     if raw_text.startswith("```"):
         raw_text = raw_text[3:]
     if raw_text.endswith("```"):
         raw_text = raw_text[:-3]
-    raw_text = raw_text.strip()
-    
-    payload = _parse_json_payload(raw_text)
-    sentences = payload.get("sentences")
-    if isinstance(sentences, list) and sentences:
-        return sentences[:num_sentences]
+    return raw_text.strip()
 
-    # Fallback if model did not return expected structure
-    return [part.strip() for part in raw_text.split("\n") if part.strip()][:num_sentences]
 
+def _offline_check(sentence: str, translation: str) -> dict:
+    is_correct = translation.strip().lower() in sentence.lower()
+    return {
+        "is_correct": is_correct,
+        "correct_translation": sentence if not is_correct else translation,
+        "explanation": "Offline check: verified by string containment."
+        if not is_correct
+        else "Translation accepted (offline).",
+    }
+
+
+def _check_shortcut(sentence: str, translation: str, language_direction: str) -> Tuple[dict, str]:
+    """Answer a check without the LLM when possible.
+
+    Returns ``(result, cache_key)``; ``result`` is None when the model has to be asked,
+    in which case ``cache_key`` (if caching is on) is where its verdict should be stored.
+    """
+    normalized_sentence = _normalize_text(sentence)
+    normalized_translation = _normalize_text(translation)
 
-def check_translation_with_genai(sentence: str, translation: str, language_direction: str = "es-to-en") -> dict:
-    api_key = settings.OPENAI_API_KEY
-    
-    # Determine source and target languages
-    if language_direction == "en-to-es":
-        source_lang = "English"
-        target_lang = "Spanish"
-    else:  # es-to-en (default)
-        source_lang = "Spanish"
-        target_lang = "English"
-    
-    if not api_key:
-        is_correct = translation.strip().lower() in sentence.lower()
-        return {
-            "is_correct": is_correct,
-            "correct_translation": sentence if not is_correct else translation,
-            "explanation": "Offline check: verified by string containment."
-            if not is_correct
-            else "Translation accepted (offline).",
-        }
-    
     # Check if translations match when normalized (ignoring accents and punctuation)
-    if _normalize_text(sentence) == _normalize_text(translation):
-        return {
-            "is_correct": True,
-            "correct_translation": translation,
-            "explanation": "",
-        }
-    
+    if normalized_sentence == normalized_translation:
+        return {"is_correct": True, "correct_translation": translation, "explanation": ""}, None
+
+    if not settings.TRANSLATION_CACHE_ENABLED:
+        return None, None
+    cache_key = translation_cache.make_key(
+        normalized_sentence,
+        normalized_translation,
+        language_direction,
+        llm.model_name(),
+    )
+    return translation_cache.get(cache_key), cache_key
+
+
+def _store_verdict(cache_key: str, result: dict, language_direction: str) -> None:
+    if cache_key:
+        translation_cache.set(
+            cache_key,
+            result,
+            language_direction=language_direction,
+            model_name=llm.model_name(),
+        )
+
+
+def _check_messages(sentence: str, translation: str, language_direction: str) -> List[dict]:
+    source_lang, target_lang = _language_pair(language_direction)
+
     # Special case: if translation is empty, just return the correct translation
     if not translation.strip():
         prompt = (
@@ -360,73 +531,491 @@ def check_translation_with_genai(sentence: str, translation: str, language_direc
         prompt = (
             f"You are checking the translation of a {source_lang} sentence into {target_lang}. "
             f"{source_lang}: {sentence}\nUser's translation: {translation}\n\n"
-            "Grade primarily by MEANING, not by perfect spelling/grammar.\n"
-            "\n"
-            "✅ Treat as CORRECT (is_correct=true) when the meaning is clearly the same, even if there are minor issues like:\n"
-            "- Typos / misspellings that are still understandable (e.g., 'bcause' vs 'because')\n"
-            "- Capitalization differences ('i' vs 'I')\n"
-            "- Punctuation differences\n"
-            "- Missing accent marks in Spanish (á é í ó ú ñ ü)\n"
-            "- Minor article/preposition differences that do not change meaning\n"
-            "- Minor word order differences that still sound natural/understandable\n"
-            "\n"
-            "🚫 Mark as INCORRECT (is_correct=false) only when there is a MEANING error, such as:\n"
-            "- Wrong subject/object (changes who did what to whom), when it is unambiguous\n"
-            "- Wrong tense/time that changes meaning (past vs future)\n"
-            "- Negation mistakes (adding/removing 'not', 'no', 'nunca', etc.)\n"
-            "- Missing or extra key information that changes meaning\n"
-            "- Wrong key vocabulary (dog vs cat, buy vs sell, etc.)\n"
-            "\n"
-            "IMPORTANT:\n"
-            "- Do NOT invent errors. Only mention a problem if it is definitely present.\n"
-            "- If the source sentence allows more than one plausible interpretation (e.g., implicit/ambiguous subject), be lenient and accept the user's translation if it matches one plausible meaning.\n"
-            "- If is_correct=true, set explanation to an empty string.\n"
+            f"{GRADING_RULES}"
             "\n"
             'Respond with JSON ONLY: {"is_correct": true/false, "correct_translation": "...", "explanation": ""}.'
         )
     
-    client = OpenAI(api_key=api_key,
-                    project='proj_75KlhDjKda9twpOyWLSJCAq2')
     system_message = f"You are a language teaching assistant. You check translations from {source_lang} to {target_lang}."
-    response = client.chat.completions.create(
-        model=settings.OPENAI_MODEL_NAME,
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _check_result(response, translation: str, cache_key: str, language_direction: str) -> dict:
+    raw_text = _strip_code_fences(response.choices[0].message.content)
+    payload = _parse_json_payload(raw_text)
+
+    result = {
+        "is_correct": bool(payload.get("is_correct", False)),
+        "correct_translation": payload.get("correct_translation", translation),
+        "explanation": payload.get("explanation", ""),
+    }
+    # Only cache answers the model actually produced, not the fallback for unparseable output.
+    if "correct_translation" in payload:
+        _store_verdict(cache_key, result, language_direction)
+    return result
+
+
+def check_translation_with_genai(
+    sentence: str, translation: str, language_direction: str = "es-to-en", user_id: int = None
+) -> dict:
+    if not llm.is_enabled():
+        return _offline_check(sentence, translation)
+
+    result, cache_key = _check_shortcut(sentence, translation, language_direction)
+    if result is not None:
+        return result
+
+    if user_id is not None:
+        quota.admit(user_id)
+    return _ask_check(sentence, translation, language_direction, cache_key, user_id)
+
+
+def _ask_check(sentence: str, translation: str, language_direction: str, cache_key: str, user_id: int = None) -> dict:
+    response = llm.chat_completion(
+        purpose=llm.PURPOSE_CHECK,
+        messages=_check_messages(sentence, translation, language_direction),
+        max_tokens=200,
+        temperature=0.7,
+        user_id=user_id,
+    )
+    return _check_result(response, translation, cache_key, language_direction)
+
+
+def check_translations_batch_with_genai(
+    items: List[Tuple[str, str]], language_direction: str = "es-to-en", user_id: int = None
+) -> List[dict]:
+    """Check several (sentence, translation) pairs, asking the LLM once for all cache misses."""
+    source_lang, target_lang = _language_pair(language_direction)
+
+    if not llm.is_enabled():
+        return [_offline_check(sentence, translation) for sentence, translation in items]
+
+    results: List[dict] = [None] * len(items)
+    # Identical pairs within one batch share a single prompt entry.
+    pending: dict = {}
+    for idx, (sentence, translation) in enumerate(items):
+        result, cache_key = _check_shortcut(sentence, translation, language_direction)
+        if result is not None:
+            results[idx] = result
+            continue
+        group_key = cache_key or (_normalize_text(sentence), _normalize_text(translation))
+        pending.setdefault(group_key, {"cache_key": cache_key, "indexes": []})["indexes"].append(idx)
+
+    if not pending:
+        return results
+    if user_id is not None:
+        quota.admit(user_id)
+
+    groups = list(pending.values())
+    lines = []
+    for item_id, group in enumerate(groups):
+        sentence, translation = items[group["indexes"][0]]
+        lines.append(
+            f"[{item_id}] {source_lang}: {sentence}\n"
+            f"[{item_id}] User's translation: {translation if translation.strip() else '(empty)'}"
+        )
+    prompt = (
+        f"You are checking translations of {len(groups)} {source_lang} sentences into {target_lang}. "
+        "Grade every item independently.\n\n"
+        + "\n\n".join(lines)
+        + "\n\n"
+        f"{GRADING_RULES}"
+        "- If the user's translation is (empty), set is_correct=false, explanation to an empty string, and give the correct translation.\n"
+        "\n"
+        'Respond with JSON ONLY: {"results": [{"id": 0, "is_correct": true/false, "correct_translation": "...", "explanation": ""}, ...]} '
+        "with exactly one entry per id."
+    )
+
+    system_message = f"You are a language teaching assistant. You check translations from {source_lang} to {target_lang}."
+    response = llm.chat_completion(
+        purpose=llm.PURPOSE_CHECK_BATCH,
         messages=[
             {"role": "system", "content": system_message},
             {"role": "user", "content": prompt},
         ],
-        max_tokens=200,
+        max_tokens=200 * len(groups),
         temperature=0.7,
+        user_id=user_id,
     )
-    raw_text = response.choices[0].message.content.strip()
-    
-    # Strip markdown code fences if present
-    if raw_text.startswith("```json"):
-        raw_text = raw_text[7:]
-    if raw_text.startswith("```"):
-        raw_text = raw_text[3:]
-    if raw_text.endswith("```"):
-        raw_text = raw_text[:-3]
-    raw_text = raw_text.strip()
-    
-    payload = _parse_json_payload(raw_text)
+    payload = _parse_json_payload(_strip_code_fences(response.choices[0].message.content))
+
+    graded = {}
+    for entry in payload.get("results") or []:
+        if isinstance(entry, dict) and "correct_translation" in entry:
+            try:
+                graded[int(entry.get("id"))] = entry
+            except (TypeError, ValueError):
+                continue
+
+    for item_id, group in enumerate(groups):
+        first = group["indexes"][0]
+        sentence, translation = items[first]
+        entry = graded.get(item_id)
+        if entry is None:
+            # The model skipped this item; grade it on its own rather than guess. Same
+            # request, so it is not admitted again.
+            result = _ask_check(sentence, translation, language_direction, group["cache_key"], user_id)
+        else:
+            result = {
+                "is_correct": bool(entry.get("is_correct", False)) if translation.strip() else False,
+                "correct_translation": entry.get("correct_translation", translation),
+                "explanation": entry.get("explanation", ""),
+            }
+            _store_verdict(group["cache_key"], result, language_direction)
+        for idx in group["indexes"]:
+            results[idx] = dict(result)
+
+    return results
+
+
+def _chat_messages(message: str) -> List[dict]:
+    system_message = (
+        "You are a helpful Spanish language tutor. "
+        "Answer questions about Spanish grammar, vocabulary, pronunciation, and culture. "
+        "Provide clear, concise explanations. "
+        "Give examples when helpful. "
+        "Be encouraging and supportive."
+    )
+    return [
+        {"role": "system", "content": system_message},
+        {"role": "user", "content": message},
+    ]
+
+
+def _generation_options(data, profile) -> dict:
+    num_sentences = int(data.get("num_sentences", 5))
+    num_sentences = max(5, min(num_sentences, 10))
+    try:
+        words_count = int(data.get("words_count", 5))
+    except (TypeError, ValueError):
+        words_count = 5
+    words_count = max(1, min(words_count, 20))
 
     return {
-        "is_correct": bool(payload.get("is_correct", False)),
-        "correct_translation": payload.get("correct_translation", translation),
-        "explanation": payload.get("explanation", ""),
+        "target_lang": profile.target_language if profile else "Spanish",
+        "native_lang": profile.native_language if profile else "English",
+        "level": data.get("level", "A1"),
+        "length": data.get("length", "короткая"),
+        "topic": data.get("topic", "any"),
+        "sentence_type": data.get("sentence_type", "mixed"),
+        "tense": data.get("tense", "mixed"),
+        "grammar_focus": data.get("grammar_focus", ""),
+        "num_sentences": num_sentences,
+        "words_count": words_count,
+        "specific_words": data.get("specific_words", []),
     }
+
+
+def _etag(*parts) -> str:
+    digest = hashlib.md5("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _not_modified(request, etag: str) -> bool:
+    """Whether ``If-None-Match`` already names ``etag`` (weak comparison)."""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    tags = {tag.removeprefix("W/") for tag in parse_etags(header)}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _conditional_response(request, etag: str, build) -> Response:
+    """304 if the client already holds ``etag``; otherwise ``build()`` with the ETag set."""
+    if _not_modified(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = build()
+    response["ETag"] = etag
+    return response
+
+
 class WordViewSet(viewsets.ModelViewSet):
+    """Vocabulary CRUD.
+
+    The list supports ``?search=`` (substring) and ``?prefix=`` filters, both on the
+    normalized text so they ignore case and accents, ``?fields=`` sparse fieldsets, and
+    opt-in keyset pagination via ``?page_size=`` / ``?cursor=``. List responses carry an
+    ETag derived from the user's revision, so an unchanged dictionary costs a 304.
+    """
+
     serializer_class = WordSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptInCursorPagination
 
     def get_queryset(self):
-        return Word.objects.filter(user=self.request.user).order_by("-id")
+        queryset = Word.objects.filter(user=self.request.user).order_by("-id")
+        if self.action != "list":
+            return queryset
+
+        params = self.request.query_params
+        prefix = normalize_for_match(params.get("prefix", ""))
+        if prefix:
+            # LIKE 'prefix%'. On PostgreSQL the pattern_ops index serves it whatever the
+            # collation; SQLite scans the user's rows of the (user, normalized_text) index.
+            queryset = queryset.filter(normalized_text__startswith=prefix)
+        search = normalize_for_match(params.get("search", ""))
+        if search:
+            queryset = queryset.filter(normalized_text__contains=search)
+
+        fields = self._requested_fields()
+        if fields is not None:
+            queryset = queryset.only("id", *fields)
+        return queryset
+
+    def _requested_fields(self):
+        if self.request.method != "GET" or "fields" not in self.request.query_params:
+            return None
+        fields = [name.strip() for name in self.request.query_params["fields"].split(",") if name.strip()]
+        unknown = sorted(set(fields) - set(WordSerializer.Meta.fields))
+        if unknown or not fields:
+            raise ValidationError({"fields": [f"Choose from: {', '.join(WordSerializer.Meta.fields)}."]})
+        return fields
+
+    def list(self, request, *args, **kwargs):
+        revision = Profile.current_revision(request.user.id)
+        etag = _etag("words", request.user.id, revision, request.get_full_path())
+        return _conditional_response(request, etag, lambda: super(WordViewSet, self).list(request, *args, **kwargs))
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """Delta sync: words changed and ids deleted after revision ``since``.
+
+        ``since=0`` (or omitted) returns the whole dictionary. Clients keep the returned
+        ``revision`` and pass it as ``since`` next time.
+        """
+        try:
+            since = int(request.query_params.get("since", 0))
+        except ValueError:
+            return Response({"detail": "'since' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user
+        # Read the revision before the rows: anything committed in between shows up now and
+        # again on the next sync, never not at all.
+        revision = Profile.current_revision(user.id)
+
+        def build():
+            words = Word.objects.filter(user=user)
+            deleted = []
+            if since > 0:
+                words = words.filter(revision__gt=since)
+                deleted = sorted(
+                    set(
+                        WordTombstone.objects.filter(user=user, revision__gt=since).values_list("word_id", flat=True)
+                    )
+                )
+            return Response(
+                {
+                    "revision": revision,
+                    "full": since <= 0,
+                    "changed": WordSerializer(words.order_by("revision", "id"), many=True).data,
+                    "deleted": deleted,
+                }
+            )
+
+        return _conditional_response(request, _etag("word-changes", user.id, revision, since), build)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self._requested_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        self._save(serializer)
 
     def perform_update(self, serializer):
-        serializer.save(user=self.request.user)
+        self._save(serializer)
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser, FormParser])
+    def bulk_import(self, request):
+        """Import words from an uploaded CSV, TSV, JSON or Anki plain-text export."""
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "Upload a file in the 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fmt = importer.detect_format(upload.name, request.data.get("format", ""))
+        except importer.ImportFormatError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        default_language = (request.data.get("language") or "").strip() or Word._meta.get_field("language").default
+        try:
+            # All or nothing: a parse error halfway through must not leave half the file imported.
+            with transaction.atomic():
+                report = importer.import_words(request.user, importer.iter_rows(upload.file, fmt), default_language)
+        except (importer.ImportFormatError, csv.Error) as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
+
+    def _save(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [WordSerializer.DUPLICATE_MESSAGE]})
+
+
+def _generation_kwargs(options: dict) -> dict:
+    return {
+        "source_language": options["target_lang"],
+        "target_language": options["native_lang"],
+        "topic": options["topic"],
+        "sentence_type": options["sentence_type"],
+        "tense": options["tense"],
+        "grammar_focus": options["grammar_focus"],
+    }
+
+
+def _generation_words(user: User, session: Session, options: dict) -> Tuple[List[Word], List[str], Session]:
+    target_lang = options["target_lang"]
+    words_count = options["words_count"]
+
+    if options["specific_words"]:
+        selected_words = list(
+            Word.objects.filter(user=user, text__in=options["specific_words"], language__iexact=target_lang)
+        )
+    else:
+        selected_words, session = _select_words(user, session, target_count=words_count, language=target_lang)
+
+    if selected_words:
+        user_words = [w.text for w in selected_words]
+    else:
+        if target_lang.lower() == "spanish":
+            base_words = list(DEFAULT_BASE_WORDS)
+            while len(base_words) < words_count:
+                base_words.extend(DEFAULT_BASE_WORDS)
+            user_words = base_words[:words_count]
+        else:
+            user_words = []
+    return selected_words, user_words, session
+
+
+def _prepare_generation(user: User, options: dict, admit: bool = False):
+    """Pick the vocabulary for a generate request, serving sentences from the pool when it can.
+
+    Returns ``(sentences, selected_words, user_words, session)``; ``sentences`` is None
+    when the model still has to be asked. With ``admit``, such a request is first let
+    through :func:`quota.admit`, which raises :class:`quota.Rejected` before the session
+    or the word rotation is touched.
+    """
+    # Serve from the pre-generated pool when the bucket has stock; specific_words
+    # requests always go to the model since the pool was built from random words.
+    bucket = None
+    pooled = None
+    if sentence_pool.is_enabled() and not options["specific_words"]:
+        spec = dict(_generation_kwargs(options), level=options["level"], length=options["length"])
+        bucket = sentence_pool.touch_bucket(user, spec, options["words_count"])
+        pooled = sentence_pool.take(bucket, options["num_sentences"])
+
+    if bucket is not None:
+        sentence_pool.refill_async(bucket)
+    if not pooled and admit:
+        quota.admit(user.id)
+
+    session = _ensure_session(user)
+    if pooled:
+        sentences, selected_words = pooled
+        user_words = [w.text for w in selected_words]
+        session.last_words_used = [w.id for w in selected_words][-10:]
+        session.save(update_fields=["last_words_used"])
+    else:
+        sentences = None
+        selected_words, user_words, session = _generation_words(user, session, options)
+    return sentences, selected_words, user_words, session
+
+
+def _create_exercises(user: User, session: Session, sentences: List[str], selected_words: List[Word]) -> List[Exercise]:
+    """Insert exercises for ``sentences`` and link them to ``selected_words`` and ``session``.
+
+    Call inside ``transaction.atomic()``. The statements do not grow with the number of
+    sentences and words: three bulk INSERTs (the exercises, then both M2M through tables),
+    then ``stats.record_exercises``, which upserts today's DailyActivity row and locks,
+    updates and saves the UserStats row (in its own savepoint).
+    """
+    exercises = Exercise.objects.bulk_create([Exercise(user=user, sentence=sentence) for sentence in sentences])
+    word_ids = list(dict.fromkeys(word.id for word in selected_words))
+    WordLink = Exercise.words_used.through
+    WordLink.objects.bulk_create(
+        [WordLink(exercise_id=exercise.id, word_id=word_id) for exercise in exercises for word_id in word_ids]
+    )
+    SessionLink = Session.exercises.through
+    SessionLink.objects.bulk_create([SessionLink(session_id=session.id, exercise_id=exercise.id) for exercise in exercises])
+    stats.record_exercises(user.id, len(exercises))
+    return exercises
+
+
+def _save_exercises(
+    user: User, session: Session, sentences: List[str], selected_words: List[Word], user_words: List[str]
+) -> Tuple[List[dict], List[Exercise]]:
+    """Store generated sentences as exercises of ``session``.
+
+    Returns ``sentences_with_words`` and the new exercises, with ``words_used`` prefetched.
+    """
+    normalized = _stored_normalized_forms(selected_words, user_words)
+    with transaction.atomic():
+        exercises = _create_exercises(user, session, sentences, selected_words)
+    prefetch_related_objects(exercises, "words_used")
+    # Find which words from the list appear in each sentence
+    sentences_with_words = [
+        {"sentence": sentence, "words_found": _find_words_in_sentence(sentence, user_words, normalized)}
+        for sentence in sentences
+    ]
+    return sentences_with_words, exercises
+
+
+def _reviewed_word_ids(exercise: Exercise) -> List[int]:
+    """Ids of the exercise's words that actually appear in its sentence."""
+    words = list(exercise.words_used.all())
+    normalized = [w.normalized_text for w in words] if all(w.normalized_text for w in words) else None
+    found = set(_find_words_in_sentence(exercise.sentence, [w.text for w in words], normalized))
+    return [w.id for w in words if w.text in found]
+
+
+def _parse_exercise_id(value):
+    """``exercise_id`` of a check request as an int (None if absent); ValueError if malformed."""
+    if value in (None, ""):
+        return None
+    if isinstance(value, bool) or not str(value).isdigit():
+        raise ValueError(value)
+    return int(value)
+
+
+def _find_exercise(user: User, sentence: str, exercise_id: int = None):
+    """The exercise a check of ``sentence`` belongs to: ``exercise_id`` if it shows that
+    sentence, else the latest exercise with it (an index probe on ``sentence_hash``)."""
+    exercises = Exercise.objects.filter(user=user, sentence=sentence)
+    if exercise_id is not None:
+        exercise = exercises.filter(pk=exercise_id).first()
+        if exercise:
+            return exercise
+    return exercises.filter(sentence_hash=sentence_digest(sentence)).order_by("-id").first()
+
+
+def _record_check(user: User, sentence: str, translation: str, result: dict, exercise_id: int = None) -> None:
+    """Store a check result on the exercise that was checked, if it can be found."""
+    exercise = _find_exercise(user, sentence, exercise_id)
+    if exercise:
+        attempted_before, correct_before = stats.attempt_state(exercise)
+        exercise.user_translation = translation
+        exercise.correct_translation = result.get("correct_translation", "")
+        exercise.is_correct = bool(result.get("is_correct", False))
+        attempted, correct = stats.attempt_state(exercise)
+        with transaction.atomic():
+            exercise.save(update_fields=["user_translation", "correct_translation", "is_correct"])
+            stats.record_attempts(user.id, attempted - attempted_before, correct - correct_before)
+            review.record_reviews(user.id, [(_reviewed_word_ids(exercise), exercise.is_correct)])
+
+
+def _rejected(exc: quota.Rejected) -> Response:
+    """The 429/503 answer to a request turned away by ``quota.admit``."""
+    return Response({"detail": exc.detail}, status=exc.status_code, headers={"Retry-After": str(exc.retry_after)})
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
 class GenerateView(APIView):
@@ -434,64 +1023,34 @@ class GenerateView(APIView):
 
     def post(self, request):
         user = request.user
-        profile = getattr(user, "profile", None)
-        target_lang = profile.target_language if profile else "Spanish"
-        native_lang = profile.native_language if profile else "English"
-
-        level = request.data.get("level", "A1")
-        length = request.data.get("length", "короткая")
-        topic = request.data.get("topic", "any")
-        sentence_type = request.data.get("sentence_type", "mixed")
-        tense = request.data.get("tense", "mixed")
-        grammar_focus = request.data.get("grammar_focus", "")
-        num_sentences = int(request.data.get("num_sentences", 5))
-        num_sentences = max(5, min(num_sentences, 10))
-        words_count_raw = request.data.get("words_count", 5)
-        specific_words = request.data.get("specific_words", [])
+        options = _generation_options(request.data, getattr(user, "profile", None))
 
-        try:
-            words_count = int(words_count_raw)
-        except (TypeError, ValueError):
-            words_count = 5
-        words_count = max(1, min(words_count, 20))
-
-        used_genai = bool(settings.OPENAI_API_KEY)
+        used_genai = llm.is_enabled()
         fallback_reason = None
 
-        session = _ensure_session(user)
-        
-        if specific_words:
-            selected_words = list(Word.objects.filter(user=user, text__in=specific_words, language__iexact=target_lang))
-        else:
-            selected_words, session = _select_words(user, session, target_count=words_count, language=target_lang)
+        # Only requests that reach the model count against the limits, not pool hits.
+        try:
+            sentences, selected_words, user_words, session = _prepare_generation(user, options, admit=used_genai)
+        except quota.Rejected as exc:
+            return _rejected(exc)
 
-        if selected_words:
-            user_words = [w.text for w in selected_words]
-        else:
-            if target_lang.lower() == "spanish":
-                base_words = list(DEFAULT_BASE_WORDS)
-                while len(base_words) < words_count:
-                    base_words.extend(DEFAULT_BASE_WORDS)
-                user_words = base_words[:words_count]
-            else:
-                user_words = []
+        stream_flag = str(request.query_params.get("stream", request.data.get("stream", ""))).lower()
+        if stream_flag in {"1", "true", "yes"}:
+            return self._stream(user, session, options, selected_words, user_words, sentences=sentences)
 
         try:
-            sentences = generate_sentences_with_genai(
-                user_words,
-                level,
-                length,
-                num_sentences,
-                source_language=target_lang,
-                target_language=native_lang,
-                topic=topic,
-                sentence_type=sentence_type,
-                tense=tense,
-                grammar_focus=grammar_focus,
-            )
+            if sentences is None:
+                sentences = generate_sentences_with_genai(
+                    user_words,
+                    options["level"],
+                    options["length"],
+                    options["num_sentences"],
+                    user_id=user.id,
+                    **_generation_kwargs(options),
+                )
         except Exception as exc:  # pragma: no cover - runtime safeguard
             message = str(exc)
-            if "RESOURCE_EXHAUSTED" in message or "quota" in message.lower():
+            if isinstance(exc, llm.OVERLOAD_ERRORS):
                 logger.warning("Generation quota hit: %s", message)
                 return Response(
                     {"detail": "AI is overloaded. Please try again later."},
@@ -504,20 +1063,7 @@ class GenerateView(APIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
-        created_exercises = []
-        sentences_with_words = []
-        with transaction.atomic():
-            for sentence in sentences:
-                exercise = Exercise.objects.create(user=user, sentence=sentence)
-                exercise.words_used.set(selected_words)
-                session.exercises.add(exercise)
-                created_exercises.append(exercise)
-                # Find which words from the list appear in this sentence
-                words_in_sentence = _find_words_in_sentence(sentence, user_words)
-                sentences_with_words.append({
-                    "sentence": sentence,
-                    "words_found": words_in_sentence
-                })
+        sentences_with_words, exercises = _save_exercises(user, session, sentences, selected_words, user_words)
 
         session.date = timezone.now()
         session.save(update_fields=["date"])
@@ -527,13 +1073,90 @@ class GenerateView(APIView):
                 "sentences": sentences,
                 "sentences_with_words": sentences_with_words,
                 "words_used": user_words,
-                "session": SessionSerializer(session).data,
+                "session": SessionSummarySerializer(session).data,
+                "exercises": ExerciseSerializer(exercises, many=True).data,
                 "used_genai": used_genai,
                 "fallback_reason": fallback_reason,
             },
             status=status.HTTP_200_OK,
         )
 
+    def _stream(
+        self,
+        user,
+        session: Session,
+        options: dict,
+        selected_words: List[Word],
+        user_words: List[str],
+        sentences: List[str] = None,
+    ):
+        """Server-sent events: one ``sentence`` event per sentence as soon as it is complete, then ``done``.
+
+        ``sentences`` short-circuits the model when they are already known (pool hit).
+        """
+        if sentences is not None:
+            source = iter(sentences)
+        else:
+            source = stream_sentences_with_genai(
+                user_words,
+                options["level"],
+                options["length"],
+                options["num_sentences"],
+                user_id=user.id,
+                **_generation_kwargs(options),
+            )
+
+        normalized = _stored_normalized_forms(selected_words, user_words)
+
+        def events():
+            sentences = []
+            sentences_with_words = []
+            try:
+                for sentence in source:
+                    with transaction.atomic():
+                        (exercise,) = _create_exercises(user, session, [sentence], selected_words)
+                    words_in_sentence = _find_words_in_sentence(sentence, user_words, normalized)
+                    sentences.append(sentence)
+                    sentences_with_words.append({"sentence": sentence, "words_found": words_in_sentence})
+                    yield _sse_event(
+                        "sentence",
+                        {
+                            "index": len(sentences) - 1,
+                            "sentence": sentence,
+                            "words_found": words_in_sentence,
+                            "exercise_id": exercise.id,
+                        },
+                    )
+            except Exception as exc:  # pragma: no cover - runtime safeguard
+                message = str(exc)
+                if isinstance(exc, llm.OVERLOAD_ERRORS):
+                    logger.warning("Generation quota hit: %s", message)
+                    yield _sse_event("error", {"detail": "AI is overloaded. Please try again later."})
+                else:
+                    logger.exception("Streaming generation failed")
+                    yield _sse_event("error", {"detail": "AI request failed. Please try again."})
+                if not sentences:
+                    return
+
+            session.date = timezone.now()
+            session.save(update_fields=["date"])
+            yield _sse_event(
+                "done",
+                {
+                    "sentences": sentences,
+                    "sentences_with_words": sentences_with_words,
+                    "words_used": user_words,
+                    "session": SessionSummarySerializer(session).data,
+                    "used_genai": llm.is_enabled(),
+                    "fallback_reason": None,
+                },
+            )
+
+        response = StreamingHttpResponse(events(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # stop nginx from buffering the stream
+        return response
+
 
 class CheckTranslationView(APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -551,12 +1174,18 @@ class CheckTranslationView(APIView):
                 {"detail": "Both 'sentence' and 'translation' are required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        try:
+            exercise_id = _parse_exercise_id(request.data.get("exercise_id"))
+        except ValueError:
+            return Response({"detail": "'exercise_id' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            result = check_translation_with_genai(sentence, translation, language_direction)
+            result = check_translation_with_genai(sentence, translation, language_direction, user_id=user.id)
+        except quota.Rejected as exc:
+            return _rejected(exc)
         except Exception as exc:
             message = str(exc)
-            if "RESOURCE_EXHAUSTED" in message or "quota" in message.lower():
+            if isinstance(exc, llm.OVERLOAD_ERRORS):
                 logger.warning("Translation check quota hit: %s", message)
                 return Response(
                     {"detail": "AI is overloaded. Please try again later."},
@@ -569,14 +1198,122 @@ class CheckTranslationView(APIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
-        exercise = Exercise.objects.filter(user=user, sentence=sentence).order_by("-id").first()
-        if exercise:
+        _record_check(user, sentence, translation, result, exercise_id)
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class BatchCheckTranslationView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        user = request.user
+        language_direction = request.data.get("language_direction", "es-to-en")
+        raw_items = request.data.get("items")
+
+        if not isinstance(raw_items, list) or not raw_items:
+            return Response(
+                {"detail": "'items' must be a non-empty list of {sentence, translation} objects."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(raw_items) > MAX_BATCH_CHECK_ITEMS:
+            return Response(
+                {"detail": f"At most {MAX_BATCH_CHECK_ITEMS} items can be checked at once."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        items = []
+        exercise_ids = []
+        for raw in raw_items:
+            if not isinstance(raw, dict):
+                raw = {}
+            sentence = raw.get("sentence")
+            translation = raw.get("translation")
+            if translation is None:
+                translation = raw.get("user_translation", "")
+            if not sentence or not isinstance(sentence, str) or not isinstance(translation, str):
+                return Response(
+                    {"detail": "Every item needs a 'sentence' and a 'translation'."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                exercise_ids.append(_parse_exercise_id(raw.get("exercise_id")))
+            except ValueError:
+                return Response({"detail": "'exercise_id' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+            items.append((sentence, translation))
+
+        try:
+            results = check_translations_batch_with_genai(items, language_direction, user_id=user.id)
+        except quota.Rejected as exc:
+            return _rejected(exc)
+        except Exception as exc:
+            message = str(exc)
+            if isinstance(exc, llm.OVERLOAD_ERRORS):
+                logger.warning("Batch translation check quota hit: %s", message)
+                return Response(
+                    {"detail": "AI is overloaded. Please try again later."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+            else:
+                logger.exception("Batch translation check failed")
+                return Response(
+                    {"detail": "AI request failed. Please try again."},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+        # The exercises named by id plus the latest one per sentence, fetched in one query and
+        # written back in one bulk_update.
+        fetched = {}
+        by_id = {}
+        latest_by_sentence = {}
+        requested_ids = {exercise_id for exercise_id in exercise_ids if exercise_id is not None}
+        hashes = {sentence_digest(sentence) for sentence, _ in items}
+        candidates = Exercise.objects.filter(user=user).filter(Q(sentence_hash__in=hashes) | Q(pk__in=requested_ids))
+        for exercise in candidates.order_by("-id"):
+            fetched[exercise.pk] = exercise
+            if exercise.pk in requested_ids:
+                by_id[exercise.pk] = exercise
+            latest_by_sentence.setdefault(exercise.sentence, exercise)
+
+        to_update = {}
+        states_before = {pk: stats.attempt_state(exercise) for pk, exercise in fetched.items()}
+        for (sentence, translation), exercise_id, result in zip(items, exercise_ids, results):
+            exercise = by_id.get(exercise_id)
+            if exercise is None or exercise.sentence != sentence:
+                exercise = latest_by_sentence.get(sentence)
+            if exercise is None:
+                continue
             exercise.user_translation = translation
             exercise.correct_translation = result.get("correct_translation", "")
             exercise.is_correct = bool(result.get("is_correct", False))
-            exercise.save(update_fields=["user_translation", "correct_translation", "is_correct"])
+            to_update[exercise.pk] = exercise
+        if to_update:
+            attempts = correct = 0
+            for pk, exercise in to_update.items():
+                attempted_after, correct_after = stats.attempt_state(exercise)
+                attempts += attempted_after - states_before[pk][0]
+                correct += correct_after - states_before[pk][1]
+            prefetch_related_objects(list(to_update.values()), "words_used")
+            with transaction.atomic():
+                Exercise.objects.bulk_update(
+                    list(to_update.values()), ["user_translation", "correct_translation", "is_correct"]
+                )
+                stats.record_attempts(user.id, attempts, correct)
+                review.record_reviews(
+                    user.id, [(_reviewed_word_ids(exercise), exercise.is_correct) for exercise in to_update.values()]
+                )
 
-        return Response(result, status=status.HTTP_200_OK)
+        return Response(
+            {"results": [dict(result, sentence=sentence) for (sentence, _), result in zip(items, results)]},
+            status=status.HTTP_200_OK,
+        )
+
+
+class TranslationCacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(translation_cache.stats(), status=status.HTTP_200_OK)
 
 
 class RegisterView(APIView):
@@ -705,32 +1442,51 @@ class LogoutView(APIView):
 
 class MeView(APIView):
     def get(self, request):
-        return Response(UserSerializer(request.user, context={"request": request}).data, status=status.HTTP_200_OK)
+        # Not request.user: with the token cache that may be a snapshot from before a change
+        # made through another worker, while the ETag would already reflect it.
+        user = User.objects.select_related("profile").get(pk=request.user.pk)
+        revision = user.profile.revision if hasattr(user, "profile") else 0
+        etag = _etag("me", user.id, user.username, user.email, revision)
+        return _conditional_response(
+            request,
+            etag,
+            lambda: Response(UserSerializer(user, context={"request": request}).data, status=status.HTTP_200_OK),
+        )
 
     def patch(self, request):
         user = request.user
-        profile = getattr(user, "profile", None)
+        # Fresh row: request.user.profile may come from the token cache. Only the fields
+        # changed here are written back.
+        profile = Profile.objects.filter(user=user).first()
         if not profile:
              return Response({"detail": "Profile not found"}, status=500)
+        user.profile = profile
+        changed = []
 
         # Handle profile picture
         if "profile_picture" in request.FILES:
             profile.profile_picture = request.FILES["profile_picture"]
+            changed.append("profile_picture")
             
         if "native_language" in request.data:
             profile.native_language = request.data["native_language"]
+            changed.append("native_language")
             
         if "target_language" in request.data:
             profile.target_language = request.data["target_language"]
+            changed.append("target_language")
 
         # Handle new fields
         if "bio" in request.data:
             profile.bio = request.data["bio"]
+            changed.append("bio")
         
         if "learning_goal" in request.data:
             profile.learning_goal = request.data["learning_goal"]
+            changed.append("learning_goal")
             
-        profile.save()
+        if changed:
+            profile.save(update_fields=changed)
         return Response(UserSerializer(user, context={"request": request}).data, status=status.HTTP_200_OK)
 
 
@@ -759,56 +1515,92 @@ class ChangePasswordView(APIView):
             return Response({"detail": "Incorrect old password."}, status=status.HTTP_400_BAD_REQUEST)
         
         user.set_password(new_password)
-        user.save()
+        # request.user may be a cached snapshot; write nothing but the password.
+        user.save(update_fields=["password"])
         # Keep user logged in
         login(request, user)
         return Response({"detail": "Password updated successfully."}, status=status.HTTP_200_OK)
 
 
 
+class SessionExercisesView(generics.ListAPIView):
+    """Exercises of one of the user's sessions, newest first, in cursor-paginated pages."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ExerciseSerializer
+    pagination_class = IdCursorPagination
+
+    def get_queryset(self):
+        session = get_object_or_404(Session, pk=self.kwargs["pk"], user=self.request.user)
+        return session.exercises.prefetch_related("words_used").order_by("-id")
+
+
 class ProgressView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
         user = request.user
 
-        total_words = Word.objects.filter(user=user).count()
-        total_exercises = Exercise.objects.filter(user=user).count()
+        user_stats = stats.get(user.id)
+        total_attempted = user_stats.attempts_total
+        accuracy = (user_stats.correct_total / total_attempted) if total_attempted else 0.0
+        last_practice_date = user_stats.last_practice_date.isoformat() if user_stats.last_practice_date else None
 
-        attempted_qs = Exercise.objects.filter(user=user).exclude(user_translation="")
-        total_attempted = attempted_qs.count()
-        total_correct = attempted_qs.filter(is_correct=True).count()
+        return Response(
+            {
+                "words_total": user_stats.words_total,
+                "exercises_total": user_stats.exercises_total,
+                "attempts_total": total_attempted,
+                "correct_total": user_stats.correct_total,
+                "accuracy": round(accuracy, 4),
+                "sessions_total": user_stats.sessions_total,
+                "days_practiced": user_stats.days_practiced,
+                "current_streak": stats.current_streak(user_stats),
+                "longest_streak": user_stats.longest_streak,
+                "last_practice_date": last_practice_date,
+            },
+            status=status.HTTP_200_OK,
+        )
 
-        accuracy = (total_correct / total_attempted) if total_attempted else 0.0
 
-        session_qs = Session.objects.filter(user=user)
-        session_count = session_qs.count()
+class ActivityView(APIView):
+    """Per-day activity for a calendar heatmap: ``?start=YYYY-MM-DD&end=YYYY-MM-DD``.
 
-        # Practice days derived from sessions (generation events)
-        practice_dates = [
-            timezone.localtime(dt).date()
-            for dt in session_qs.values_list("date", flat=True)
-            if dt is not None
-        ]
-        practice_date_set = sorted(set(practice_dates))
-        today = timezone.localdate()
+    Defaults to the year ending today. Only days with activity are listed.
+    """
 
-        current_streak = _compute_streak(list(reversed(practice_date_set)), today=today)
-        longest_streak = _compute_longest_streak(practice_date_set)
-        last_practice_date = practice_date_set[-1].isoformat() if practice_date_set else None
+    permission_classes = [permissions.IsAuthenticated]
+    MAX_DAYS = 731
 
+    def get(self, request):
+        try:
+            end = date.fromisoformat(request.query_params["end"]) if "end" in request.query_params else timezone.localdate()
+            start = (
+                date.fromisoformat(request.query_params["start"])
+                if "start" in request.query_params
+                else end - timedelta(days=364)
+            )
+        except ValueError:
+            return Response({"detail": "Dates must be YYYY-MM-DD."}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end or (end - start).days >= self.MAX_DAYS:
+            return Response(
+                {"detail": f"'start' must not be after 'end', and the range is limited to {self.MAX_DAYS} days."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        days = (
+            DailyActivity.objects.filter(user=request.user, date__gte=start, date__lte=end)
+            .order_by("date")
+            .values("date", "exercises", "attempts", "correct")
+        )
+        user_stats = stats.get(request.user.id)
         return Response(
             {
-                "words_total": total_words,
-                "exercises_total": total_exercises,
-                "attempts_total": total_attempted,
-                "correct_total": total_correct,
-                "accuracy": round(accuracy, 4),
-                "sessions_total": session_count,
-                "days_practiced": len(practice_date_set),
-                "current_streak": current_streak,
-                "longest_streak": longest_streak,
-                "last_practice_date": last_practice_date,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "days": [dict(day, date=day["date"].isoformat()) for day in days],
+                "current_streak": stats.current_streak(user_stats),
+                "longest_streak": user_stats.longest_streak,
             },
             status=status.HTTP_200_OK,
         )
@@ -826,37 +1618,34 @@ class ChatView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        api_key = settings.OPENAI_API_KEY
-        if not api_key:
+        if not llm.is_enabled():
             return Response(
                 {"response": "Sorry, AI chat is not available at the moment."},
                 status=status.HTTP_200_OK,
             )
         
         try:
-            client = OpenAI(api_key=api_key, project='proj_75KlhDjKda9twpOyWLSJCAq2')
-            system_message = (
-                "You are a helpful Spanish language tutor. "
-                "Answer questions about Spanish grammar, vocabulary, pronunciation, and culture. "
-                "Provide clear, concise explanations. "
-                "Give examples when helpful. "
-                "Be encouraging and supportive."
-            )
-            
-            response = client.chat.completions.create(
-                model=settings.OPENAI_MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": message},
-                ],
+            quota.admit(request.user.id)
+            response = llm.chat_completion(
+                purpose=llm.PURPOSE_CHAT,
+                messages=_chat_messages(message),
                 max_tokens=350,
                 temperature=0.7,
+                user_id=request.user.id,
             )
             
             ai_response = response.choices[0].message.content.strip()
             
             return Response({"response": ai_response}, status=status.HTTP_200_OK)
             
+        except quota.Rejected as exc:
+            return _rejected(exc)
+        except llm.OVERLOAD_ERRORS as exc:
+            logger.warning("Chat quota hit: %s", exc)
+            return Response(
+                {"detail": "AI is overloaded. Please try again later."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
         except Exception as exc:
             logger.exception("Chat request failed")
             return Response(